@@ -0,0 +1,175 @@
+from contextlib import contextmanager
+import json
+from pathlib import Path
+import time
+import tracemalloc
+import pytest
+
+try:
+    # A private module of Playwright, which an upgrade may move or change
+    from playwright._impl._connection import Channel
+except ImportError:
+    Channel = None
+
+DEFAULT_SIZES = "10,100,1000"
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--bench-out",
+        default="bench_results.json",
+        help="Where to save the benchmark results (default: bench_results.json).",
+    )
+    parser.addoption(
+        "--bench-baseline",
+        default=None,
+        help="Benchmark results of an earlier run to compare with.",
+    )
+    parser.addoption(
+        "--bench-sizes",
+        default=DEFAULT_SIZES,
+        help=f"Comma separated numbers of listings in the stand-in (default: {DEFAULT_SIZES}).",
+    )
+
+
+def pytest_generate_tests(metafunc):
+    if "num_of_listings" in metafunc.fixturenames:
+        sizes = metafunc.config.getoption("--bench-sizes").split(",")
+        metafunc.parametrize("num_of_listings", [int(size) for size in sizes])
+
+
+class RoundTripCounter:
+    """
+    Counts the calls the client makes to the browser, by patching the channel all of them go through.
+
+    Skips the benchmark if this version of Playwright has no such channel to patch.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._original_send = None
+
+    def __enter__(self):
+        if Channel is None or not hasattr(Channel, "_inner_send"):
+            pytest.skip(
+                "Can't count the browser round trips: this version of Playwright has no "
+                "playwright._impl._connection.Channel._inner_send to patch."
+            )
+
+        self._original_send = Channel._inner_send
+        counter = self
+
+        async def counting_send(channel, *args, **kwargs):
+            counter.count += 1
+            return await counter._original_send(channel, *args, **kwargs)
+
+        Channel._inner_send = counting_send
+        return self
+
+    def __exit__(self, *exc_info):
+        Channel._inner_send = self._original_send
+
+
+class Bench:
+    """
+    Measures operations and collects their results for the session.
+    """
+
+    def __init__(self, results: list, test_name: str, browser_name: str | None):
+        self.results = results
+        self.test_name = test_name
+        self.browser_name = browser_name
+
+    @contextmanager
+    def measure(
+        self, name: str, size: int | None = None, repeat: int = 1, trace_memory: bool = True
+    ):
+        """
+        Measures the wall time, browser round trips and peak Python memory of the block.
+
+        Args:
+            name (str): The name of the operation.
+            size (int, optional): The size of the input (for example the number of listings).
+            repeat (int, optional): How many times the block runs the operation (the results are per run).
+            trace_memory (bool, optional): Whether to trace the memory, which slows tight loops down.
+        """
+
+        if trace_memory:
+            tracemalloc.start()
+
+        start = time.perf_counter()
+
+        with RoundTripCounter() as counter:
+            yield
+
+        wall_time = time.perf_counter() - start
+        peak_memory = 0
+
+        if trace_memory:
+            _, peak_memory = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        self.results.append(
+            {
+                "name": name,
+                "browser": self.browser_name,
+                "size": size,
+                "wall_time": wall_time / repeat,
+                "round_trips": counter.count / repeat,
+                "peak_memory_kib": peak_memory / 1024,
+            }
+        )
+
+
+def result_key(result: dict) -> tuple:
+    return result["name"], result["browser"], result["size"]
+
+
+@pytest.fixture(scope="session")
+def bench_results(request):
+    results = []
+    request.config.stash["bench_results"] = results
+    return results
+
+
+@pytest.fixture
+def bench(request, bench_results):
+    browser_name = request.getfixturevalue("browser_name") if "page" in request.fixturenames else None
+    return Bench(bench_results, request.node.name, browser_name)
+
+
+def pytest_sessionfinish(session):
+    results = session.config.stash.get("bench_results", None)
+
+    if results:
+        Path(session.config.getoption("--bench-out")).write_text(json.dumps(results, indent=2))
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    results = config.stash.get("bench_results", None)
+
+    if not results:
+        return
+
+    baseline = {}
+    baseline_path = config.getoption("--bench-baseline")
+
+    if baseline_path:
+        baseline = {result_key(result): result for result in json.loads(Path(baseline_path).read_text())}
+
+    terminalreporter.section("benchmarks")
+    terminalreporter.write_line(
+        f"{'operation':<34}{'browser':<10}{'size':>7}{'wall (ms)':>12}{'trips':>9}{'mem (KiB)':>12}{'vs baseline':>14}"
+    )
+
+    for result in sorted(results, key=lambda result: tuple(str(part) for part in result_key(result))):
+        comparison = ""
+        previous = baseline.get(result_key(result))
+
+        if previous and previous["wall_time"]:
+            comparison = f"{result['wall_time'] / previous['wall_time'] - 1:+.1%}"
+
+        terminalreporter.write_line(
+            f"{result['name']:<34}{result['browser'] or '-':<10}{result['size'] if result['size'] is not None else '-':>7}"
+            f"{result['wall_time'] * 1000:>12.3f}{result['round_trips']:>9.0f}{result['peak_memory_kib']:>12.1f}{comparison:>14}"
+        )
@@ -0,0 +1,156 @@
+from datetime import date, datetime
+import pytest
+from pages.apt_details import AptDetails
+from pages.home_page import HomePage
+from pages.reservation_page import ReservationPage
+from pages.search_results import SearchResultsPage
+from utils.card_columns import CardColumns
+from utils.records import CardRecord
+from utils.results_scan import ResultsScan
+from utils.stand_in_server import StandInConfig, StandInServer
+from utils.util import format_date_to_airbnb, parse_dates, parse_guests
+
+LOCATION = "Tel Aviv"
+CHECK_IN_DATE = datetime(2025, 5, 1)
+CHECK_OUT_DATE = datetime(2025, 5, 5)
+CALENDAR_START = date(2025, 1, 1)  # so the home page calendar shows the dates above, whatever the date
+CARDS_PER_PAGE = 18
+MICRO_REPEAT = 10_000
+
+
+@pytest.fixture
+def stand_in_server():
+    config = StandInConfig(cards_per_page=CARDS_PER_PAGE, num_of_pages=1, calendar_start=CALENDAR_START)
+
+    with StandInServer(config) as server:
+        yield server
+
+
+def open_results(page, server) -> SearchResultsPage:
+    page.goto(
+        server.search_url(
+            LOCATION,
+            checkin=f"{CHECK_IN_DATE:%Y-%m-%d}",
+            checkout=f"{CHECK_OUT_DATE:%Y-%m-%d}",
+            adults=2,
+            children=1,
+        )
+    )
+    return SearchResultsPage(page)
+
+
+def test_search_apartments(page, bench, stand_in_server):
+    home_page = HomePage(page, stand_in_server.url)
+    home_page.goto()
+
+    with bench.measure("HomePage.search_apartments"):
+        home_page.search_apartments(LOCATION, CHECK_IN_DATE, CHECK_OUT_DATE, 2, 1)
+        page.wait_for_url("**/s/**")
+
+
+@pytest.mark.parametrize("cards_per_page", [6, 18, 50])
+def test_get_max_card_rating_in_page(page, bench, cards_per_page):
+    config = StandInConfig(cards_per_page=cards_per_page, num_of_pages=1)
+
+    with StandInServer(config) as server:
+        search_results_page = open_results(page, server)
+
+        with bench.measure("get_max_card_rating_in_page", cards_per_page):
+            search_results_page.get_max_card_rating_in_page()
+
+
+def test_find_cheapest(page, bench, num_of_listings):
+    config = StandInConfig(cards_per_page=CARDS_PER_PAGE, num_of_listings=num_of_listings)
+
+    with StandInServer(config) as server:
+        search_results_page = open_results(page, server)
+
+        with bench.measure("SearchResultsPage.find_cheapest", num_of_listings):
+            search_results_page.find_cheapest()
+
+
+@pytest.mark.parametrize("prefetch", [False, True], ids=["one-tab", "prefetch"])
+def test_scan(page, bench, num_of_listings, prefetch):
+    # Every request takes a while, as on the real site, so loading and reading can overlap
+    config = StandInConfig(cards_per_page=CARDS_PER_PAGE, num_of_listings=num_of_listings, delay=0.2)
+
+    with StandInServer(config) as server:
+        search_results_page = open_results(page, server)
+
+        with bench.measure(f"SearchResultsPage.scan(prefetch={prefetch})", num_of_listings):
+            search_results_page.scan(prefetch=prefetch)
+
+
+def open_details(page, server) -> AptDetails:
+    search_results_page = open_results(page, server)
+    card = search_results_page.extract_cards()[0]
+    page.goto(card.url)
+    return AptDetails(page)
+
+
+def test_get_total_price(page, bench, stand_in_server):
+    details_page = open_details(page, stand_in_server)
+
+    with bench.measure("AptDetails.get_total_price"):
+        details_page.get_total_price()
+
+
+def test_snapshot(page, bench, stand_in_server):
+    details_page = open_details(page, stand_in_server)
+
+    with bench.measure("AptDetails.snapshot"):
+        details_page.snapshot()
+
+
+def test_verify_reservation(page, bench, stand_in_server):
+    details_page = open_details(page, stand_in_server)
+    details_page.click_reserve_button()
+
+    with bench.measure("ReservationPage.verify_reservation"):
+        ReservationPage(page).verify_reservation(2, 1, CHECK_IN_DATE, CHECK_OUT_DATE)
+
+
+def test_parse_dates(bench):
+    with bench.measure("parse_dates", repeat=MICRO_REPEAT, trace_memory=False):
+        for _ in range(MICRO_REPEAT):
+            parse_dates("May 30 – Jun 2, 2025")
+
+
+def test_parse_guests(bench):
+    with bench.measure("parse_guests", repeat=MICRO_REPEAT, trace_memory=False):
+        for _ in range(MICRO_REPEAT):
+            parse_guests("2 adults, 1 child")
+
+
+def test_format_date_to_airbnb(bench):
+    with bench.measure("format_date_to_airbnb", repeat=MICRO_REPEAT, trace_memory=False):
+        for _ in range(MICRO_REPEAT):
+            format_date_to_airbnb(CHECK_IN_DATE)
+
+
+def raw_cards(num_of_listings: int) -> list[dict]:
+    return [
+        {
+            "index": position,
+            "text": f"Apartment #{position}\n4.{position % 100:02d} out of 5 average rating, {position} reviews"
+            f"\n₪{400 + position % 500}\nShow price breakdown",
+            "url": f"https://www.airbnb.com/rooms/{1_000_000 + position}",
+        }
+        for position in range(num_of_listings)
+    ]
+
+
+def test_card_records(bench, num_of_listings):
+    cards = raw_cards(num_of_listings)
+
+    with bench.measure("CardRecord.from_raw", num_of_listings):
+        ResultsScan([CardRecord.from_raw(card) for card in cards]).top_rated(10)
+
+
+def test_card_columns(bench, num_of_listings):
+    cards = raw_cards(num_of_listings)
+
+    with bench.measure("CardColumns.add_raw", num_of_listings):
+        card_columns = CardColumns()
+        card_columns.add_raw(cards)
+        card_columns.order_by("ratings", descending=True, positions=card_columns.where(min_rating=0))[:10]
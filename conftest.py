@@ -1,8 +1,358 @@
+import logging
+from pathlib import Path
+import re
 import pytest
+from utils.browser_pool import ContextPool
+from utils.instrumentation import StepTracer, slowest_steps
+from utils.interstitials import InterstitialHandlers
+from utils.listing_store import ListingStore
+from utils.resource_blocking import ResourcePolicy
+from utils.scheduling import DURATIONS_CACHE_KEY, DurationRecorder, LongestFirstPlugin, sort_longest_first
+from utils.search_query import SEARCH_MODES
+from utils.search_session import SearchSession
+from utils.stand_in_server import StandInConfig, StandInServer
 
 CARD_LOAD_TIMEOUT = 5_000  # ms
+CARD_SETTLE_TIME = 250  # ms without changes in the number of cards
+CAPTURE_POLL_INTERVAL = 50  # ms between checks of the captured search data
+SCAN_MAX_TABS = 4  # results pages loaded at the same time by a parallel scan
+DETAILS_MAX_TABS = 4  # details pages loaded at the same time by a fan-out
+DETAILS_LOAD_TIMEOUT = 30_000  # ms for a details page to show its total price
+DETAILS_POLL_INTERVAL = 100  # ms between checks of the loading details pages
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--resource-policy",
+        default="none",
+        choices=sorted(ResourcePolicy.PRESETS),
+        help="Requests to block while browsing (override per test with the resource_policy marker).",
+    )
+    parser.addoption(
+        "--har-mode",
+        default="off",
+        choices=["off", "record", "replay"],
+        help="Record the network traffic of every test to a HAR file, or replay it from there offline.",
+    )
+    parser.addoption(
+        "--har-dir",
+        default="hars",
+        help="The directory of the HAR files (default: hars).",
+    )
+    parser.addoption(
+        "--reuse-contexts",
+        action="store_true",
+        help="Reuse warmed-up browser contexts between tests instead of creating one per test.",
+    )
+    parser.addoption(
+        "--search-mode",
+        default="url",
+        choices=SEARCH_MODES,
+        help="How the tests search: by loading the results URL, or by filling the home page's search form.",
+    )
+    parser.addoption(
+        "--listing-store",
+        default=None,
+        help="A SQLite file to record the scanned listings in, and to scan incrementally from.",
+    )
+    parser.addoption(
+        "--fast",
+        action="store_true",
+        help="Run the browsers headless, whatever pytest.ini says.",
+    )
+    parser.addoption(
+        "--trace-steps",
+        action="store_true",
+        help="Time every page-object method and Playwright call, and save a timeline per test.",
+    )
+    parser.addoption(
+        "--trace-steps-dir",
+        default="step_traces",
+        help="The directory of the step timelines (default: step_traces).",
+    )
+    parser.addoption(
+        "--trace-steps-top",
+        type=int,
+        default=10,
+        help="The number of slowest steps to show at the end of the session (default: 10).",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "resource_policy(name, **overrides): the resource blocking policy of the test.",
+    )
+    config.addinivalue_line(
+        "markers",
+        "stand_in(**config): the configuration of the stand-in server (see StandInConfig).",
+    )
+
+    # Workers report their tests to the main process, which records the durations for the next runs
+    if not hasattr(config, "workerinput"):
+        config.pluginmanager.register(DurationRecorder(config), "duration_recorder")
+
+        # Running in parallel with pytest-xdist: schedule the longest tests first
+        if config.pluginmanager.hasplugin("xdist"):
+            config.pluginmanager.register(LongestFirstPlugin(), "longest_first")
+
+    if config.getoption("--trace-steps"):
+        tracer = StepTracer()
+        tracer.install()
+        config.stash["step_tracer"] = tracer
+        config.stash["step_timelines"] = {}
+
+
+def pytest_collection_modifyitems(config, items):
+    # Only matters to the workers of a parallel run, which must all sort the tests the same way
+    if hasattr(config, "workerinput") and getattr(config, "cache", None) is not None:
+        sort_longest_first(items, config.cache.get(DURATIONS_CACHE_KEY, {}))
+
+
+def pytest_unconfigure(config):
+    tracer = config.stash.get("step_tracer", None)
+
+    if tracer is not None:
+        tracer.uninstall()
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    timelines = config.stash.get("step_timelines", None)
+
+    if not timelines:
+        return
+
+    terminalreporter.section("slowest steps")
+
+    for step in slowest_steps(timelines, config.getoption("--trace-steps-top")):
+        terminalreporter.write_line(
+            f"{step['duration']:8.3f}s  {step['name']:<45} calls: {step['calls']:<4}"
+            f" wait: {step['wait']:.3f}s  work: {step['work']:.3f}s  ({step['test']})"
+        )
 
 
 @pytest.fixture(scope="session")
 def base_url():
     return "https://www.airbnb.com/"
+
+
+@pytest.fixture(scope="session")
+def browser_type_launch_args(browser_type_launch_args, pytestconfig):
+    if pytestconfig.getoption("--fast"):
+        return {**browser_type_launch_args, "headless": True}
+
+    return browser_type_launch_args
+
+
+@pytest.fixture(scope="session")
+def browser_context_args(browser_context_args):
+    return {
+        **browser_context_args,
+        "locale": "en-US",
+        "extra_http_headers": {"Accept-Language": "en-US"},
+    }
+
+
+@pytest.fixture(scope="session")
+def context_pool(browser, browser_context_args, base_url):
+    """
+    The reusable browser contexts of a browser (see --reuse-contexts).
+    """
+
+    pool = ContextPool(browser, browser_context_args, warm_up_url=base_url)
+
+    yield pool
+
+    pool.close()
+
+
+@pytest.fixture
+def context(request, new_context):
+    """
+    The browser context of the test: a new one, or one from the context pool with --reuse-contexts.
+    """
+
+    # HAR files are written when their context closes, so recording needs a context per test
+    if not request.config.getoption("--reuse-contexts") or (
+        request.config.getoption("--har-mode") == "record"
+    ):
+        yield new_context()
+        return
+
+    pool = request.getfixturevalue("context_pool")
+    browser_context = pool.acquire()
+
+    yield browser_context
+
+    pool.release(browser_context)
+
+
+@pytest.fixture(autouse=True)
+def step_trace(request):
+    """
+    Saves the step timeline of the test (see --trace-steps).
+    """
+
+    tracer = request.config.stash.get("step_tracer", None)
+
+    if tracer is None:
+        yield None
+        return
+
+    tracer.reset()
+
+    yield tracer
+
+    if not tracer.steps:
+        return
+
+    trace_dir = Path(request.config.getoption("--trace-steps-dir"))
+    file_name = re.sub(r"[^\w\[\]\-.]", "_", request.node.nodeid)
+
+    tracer.save(trace_dir / f"{file_name}.json")
+    request.config.stash["step_timelines"][request.node.nodeid] = tracer.timeline()
+
+
+@pytest.fixture(scope="session")
+def listing_store(pytestconfig):
+    """
+    The store of the scanned listings (see --listing-store), None without one.
+    """
+
+    path = pytestconfig.getoption("--listing-store")
+
+    if path is None:
+        yield None
+        return
+
+    with ListingStore(path) as store:
+        yield store
+
+
+@pytest.fixture(scope="module")
+def search_session(request, browser_name, base_url, listing_store):
+    """
+    The searches made by the tests of the module in the current browser (see SearchSession).
+    """
+
+    return SearchSession(base_url, request.config.getoption("--search-mode"), listing_store)
+
+
+@pytest.fixture
+def stand_in(request):
+    """
+    A local stand-in for the site, configured by the stand_in markers of the test
+    (the ones closer to the test override the module's and the class's).
+    """
+
+    config_args = {}
+
+    for marker in reversed(list(request.node.iter_markers("stand_in"))):
+        config_args.update(marker.kwargs)
+
+    config = StandInConfig(**config_args)
+
+    with StandInServer(config) as server:
+        yield server
+
+
+@pytest.fixture(autouse=True)
+def resource_policy(request):
+    """
+    Applies the resource blocking policy to the browser context of the test (browser tests only).
+    """
+
+    if "page" not in request.fixturenames and "context" not in request.fixturenames:
+        yield None
+        return
+
+    marker = request.node.get_closest_marker("resource_policy")
+
+    if marker:
+        name = marker.args[0] if marker.args else request.config.getoption("--resource-policy")
+        policy = ResourcePolicy.preset(name, **marker.kwargs)
+    else:
+        policy = ResourcePolicy.preset(request.config.getoption("--resource-policy"))
+
+    if policy.is_empty:
+        yield None
+        return
+
+    policy.apply(request.getfixturevalue("context"))
+
+    yield policy
+
+    logging.info(policy.report())
+
+
+@pytest.fixture(autouse=True)
+def interstitials(request):
+    """
+    Dismisses the overlays (translation popup, cookie consent, login nag) whenever they show up
+    in the pages of the test (browser tests only).
+    """
+
+    if "page" not in request.fixturenames and "context" not in request.fixturenames:
+        yield None
+        return
+
+    handlers = InterstitialHandlers()
+    browser_context = request.getfixturevalue("context")
+    handlers.apply(browser_context)
+
+    yield handlers
+
+    handlers.remove(browser_context)
+
+    if handlers.dismissed:
+        logging.info(f"Dismissed overlays: {dict(handlers.dismissed)}")
+
+
+def har_path(request) -> Path:
+    """
+    The HAR file of a test, for example "hars/test_airbnb/test_search[chromium].har".
+    """
+
+    har_dir = Path(request.config.getoption("--har-dir"))
+
+    if not har_dir.is_absolute():
+        har_dir = Path(request.config.rootpath) / har_dir
+
+    file_name = re.sub(r"[^\w\[\]\-.]", "_", request.node.name)
+
+    return har_dir / request.node.path.stem / f"{file_name}.har"
+
+
+@pytest.fixture(autouse=True)
+def har(request, resource_policy):
+    """
+    Records the network traffic of the test to its HAR file, or serves it from there
+    (browser tests only, see --har-mode).
+
+    Requests missing from the HAR abort when replaying, so a replayed test never goes online.
+    """
+
+    har_mode = request.config.getoption("--har-mode")
+
+    if har_mode == "off" or (
+        "page" not in request.fixturenames and "context" not in request.fixturenames
+    ):
+        yield None
+        return
+
+    path = har_path(request)
+
+    if har_mode == "replay" and not path.exists():
+        pytest.skip(f"No HAR to replay at {path}")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Registered after the resource policy, so it takes precedence over it
+    request.getfixturevalue("context").route_from_har(
+        path,
+        update=har_mode == "record",
+        update_content="embed",
+        not_found="abort",
+    )
+
+    yield path
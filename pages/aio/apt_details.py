@@ -0,0 +1,59 @@
+from datetime import datetime
+import logging
+from pages.apt_details import BOOKING_SNAPSHOT_SCRIPT, AptDetailsBase
+from utils.records import BookingSnapshot
+from utils.util import parse_total_price, parse_trip_dates, parse_trip_guests
+
+
+class AsyncAptDetails(AptDetailsBase):
+    """
+    The async counterpart of AptDetails, for use with playwright.async_api.
+    """
+
+    # Actions
+
+    async def click_close_translation_popup_button(self):
+        """
+        Closes the translation popup if it is showing, without waiting for it to show up.
+
+        When it shows up later, the interstitial handlers close it (see utils/interstitials.py).
+        """
+
+        try:
+            if await self.translation_header().is_visible():
+                await self.close_translation_popup_button().click()
+        except Exception as e:
+            # Don't raise an error if the button is not found or clickable
+            logging.debug("Failed to close translation popup: %s", str(e))
+
+    async def get_dates(self) -> tuple[datetime, datetime]:
+        await self.trip_dates().wait_for(state="visible")
+
+        return parse_trip_dates(await self.trip_dates().inner_text())
+
+    async def get_number_of_guests(self) -> int:
+        await self.trip_guests().wait_for(state="visible")
+
+        return parse_trip_guests(await self.trip_guests().inner_text())
+
+    async def get_total_price(self) -> int:
+        await self.total_price().wait_for(state="visible")
+
+        return parse_total_price(await self.total_price().inner_text())
+
+    async def snapshot(self) -> BookingSnapshot:
+        await self.booking_panel_total().wait_for(state="visible")
+
+        return BookingSnapshot.from_raw(await self.booking_panel().evaluate(BOOKING_SNAPSHOT_SCRIPT))
+
+    async def read_snapshot(self) -> BookingSnapshot | None:
+        if not await self.booking_panel().is_visible():
+            return None
+
+        try:
+            return BookingSnapshot.from_raw(await self.booking_panel().evaluate(BOOKING_SNAPSHOT_SCRIPT))
+        except ValueError:
+            return None
+
+    async def click_reserve_button(self):
+        await self.reserve_button().click()
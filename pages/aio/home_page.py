@@ -0,0 +1,104 @@
+from datetime import datetime
+from pages.home_page import HomePageBase
+from utils.search_query import SearchQuery
+
+
+class AsyncHomePage(HomePageBase):
+    """
+    The async counterpart of HomePage, for use with playwright.async_api.
+    """
+
+    async def goto(self):
+        await self.page.context.set_extra_http_headers({"Accept-Language": "en-US"})
+        await self.page.goto(self.base_url)
+
+    # Actions
+
+    async def click_search_input(self):
+        await self.search_input().click()
+
+    async def fill_where(self, location):
+        await self.search_input().fill(location)
+
+    async def press_enter(self):
+        await self.search_input().press("Enter")
+
+    async def select_dates(self, check_in_date: datetime, check_out_date: datetime):
+        check_in_button = self.date_button(check_in_date)
+        check_out_button = self.date_button(check_out_date)
+        await check_in_button.click()
+        await check_out_button.click()
+
+    async def click_guests_button(self):
+        await self.guests_button().click()
+
+    async def click_add_adult(self):
+        await self.adults_increase_button().click()
+
+    async def click_add_child(self):
+        await self.children_increase_button().click()
+
+    async def add_num_of_adults(self, num_of_adults):
+        for _ in range(num_of_adults):
+            await self.click_add_adult()
+
+    async def add_num_of_children(self, num_of_children):
+        for _ in range(num_of_children):
+            await self.click_add_child()
+
+    async def click_search_button(self):
+        await self.search_button().click()
+
+    async def goto_results(self, query: SearchQuery):
+        await self.page.goto(query.url(self.base_url))
+
+    async def search_apartments(
+        self,
+        location: str,
+        check_in_date: datetime,
+        check_out_date: datetime,
+        num_of_adults: int = 0,
+        num_of_children: int = 0,
+    ):
+        # Search for an apartment in the specified location
+        await self.click_search_input()
+        await self.fill_where(location)
+        await self.press_enter()
+
+        # Choose the check-in and check-out dates
+        await self.select_dates(check_in_date, check_out_date)
+
+        # Select guests
+        await self.click_guests_button()
+        await self.add_num_of_adults(num_of_adults)
+        await self.add_num_of_children(num_of_children)
+
+        # Search for available apartments
+        await self.click_search_button()
+
+    async def search(self, query: SearchQuery, mode: str = "url"):
+        """
+        Searches for apartments, straight through the results URL or by filling the search form.
+
+        Args:
+            query (SearchQuery): The parameters of the search.
+            mode (str, optional): "url" to load the results directly (one navigation),
+                                  or "ui" to fill the search form of the home page. Defaults to "url".
+
+        Raises:
+            ValueError: If the mode is unknown.
+        """
+
+        if mode == "url":
+            await self.goto_results(query)
+        elif mode == "ui":
+            await self.goto()
+            await self.search_apartments(
+                query.location,
+                query.check_in_date,
+                query.check_out_date,
+                query.num_of_adults,
+                query.num_of_children,
+            )
+        else:
+            raise ValueError(f"Unknown search mode: {mode}")
@@ -0,0 +1,43 @@
+from pages.reservation_page import ReservationPageBase, check_reservation_details
+from utils.layouts import async_detect_layout
+
+
+class AsyncReservationPage(ReservationPageBase):
+    """
+    The async counterpart of ReservationPage, for use with playwright.async_api.
+    """
+
+    # Actions
+
+    async def click_continue_button(self):
+        await self.continue_button().click()
+
+    async def fill_phone_number(self, phone_number):
+        await self.phone_number_input().fill(phone_number)
+
+    async def signup_with_phone(self, phone_number):
+        # See phone_layouts for the two kinds of reservation pages
+        if await async_detect_layout(self.phone_layouts()) == "continue":
+            await self.click_continue_button()
+            await self.phone_number_input().wait_for(state="visible")
+
+        await self.fill_phone_number(phone_number)
+
+    async def read_trip_details(self) -> tuple[str, str]:
+        if await async_detect_layout(self.trip_details_layouts()) == "summary":
+            return self.trip_details_from_summary(await self.reservation_summary().inner_text())
+
+        return self.trip_details_from_rows(
+            await self.left_dates_locator().inner_text(), await self.left_guests_locator().inner_text()
+        )
+
+    # Validations
+
+    async def verify_reservation(self, exp_adults, exp_children, exp_check_in, exp_check_out):
+        await self.header().wait_for(state="visible")
+
+        dates_text, guests_text = await self.read_trip_details()
+
+        check_reservation_details(
+            dates_text, guests_text, exp_adults, exp_children, exp_check_in, exp_check_out
+        )
@@ -0,0 +1,425 @@
+import asyncio
+from contextlib import aclosing
+from datetime import datetime
+import logging
+import time
+from playwright.async_api import Page, expect
+from typing import AsyncIterator, Callable, Iterable
+from urllib.parse import urljoin
+from conftest import DETAILS_LOAD_TIMEOUT, DETAILS_MAX_TABS, DETAILS_POLL_INTERVAL, SCAN_MAX_TABS
+from pages.aio.apt_details import AsyncAptDetails
+from pages.search_results import (
+    EXTRACT_CARDS_SCRIPT,
+    MAX_RATING,
+    PAGINATION_LINKS_SCRIPT,
+    START_LOADING_SCRIPT,
+    WAIT_FOR_CARDS_SCRIPT,
+    SearchResultsPageBase,
+)
+from utils.ranking import MIN_REVIEWS, Ranker
+from utils.records import BookingSnapshot, CardRecord
+from utils.results_scan import ResultsScan
+from utils.util import parse_card_price, parse_card_rating, parse_dates
+
+
+class AsyncSearchResultsPage(SearchResultsPageBase):
+    """
+    The async counterpart of SearchResultsPage, for use with playwright.async_api.
+    """
+
+    # Actions
+
+    async def click_results_dates(self):
+        await self.results_dates().click()
+
+    async def change_page(self, button):
+        current_url = self.page.url
+        self._stale_first_card_url = self._first_card_url
+
+        await button.click()
+        await self.page.wait_for_url(lambda url: url != current_url)
+
+    async def click_next_page(self):
+        await self.change_page(self.next_page_button())
+        self.page_number += 1
+
+    async def click_previous_page(self):
+        await self.change_page(self.previous_page_button())
+        self.page_number -= 1
+
+    async def go_back_n_pages(self, n):
+        for _ in range(n):
+            if await self.previous_page_button().is_enabled():
+                await self.click_previous_page()
+            else:
+                logging.info("No more previous pages to go back to.")
+                break
+
+    async def go_back_to_first_page(self):
+        await self.change_page(self.first_page_button())
+        self.page_number = 1
+
+    async def start_loading(self, url: str, page_number: int):
+        self.page_number = page_number
+        self._stale_first_card_url = None
+        self._loading_from = self.page.url
+
+        await self.page.evaluate(START_LOADING_SCRIPT, url)
+
+    async def wait_until_loaded(self):
+        if self._loading_from is None:
+            return
+
+        loading_from = self._loading_from
+        await self.page.wait_for_url(lambda url: url != loading_from, wait_until="commit")
+        self._loading_from = None
+
+    async def wait_for_cards(self) -> int:
+        card_count = await self.page.evaluate(WAIT_FOR_CARDS_SCRIPT, self.wait_for_cards_args())
+        self._stale_first_card_url = None
+
+        return card_count
+
+    async def extract_cards(self) -> list[CardRecord]:
+        if await self.wait_for_cards() == 0:
+            logging.debug("No cards were found in the page.")
+            return []
+
+        return self.to_cards(await self.cards_locator().evaluate_all(EXTRACT_CARDS_SCRIPT))
+
+    async def get_card_rating(self, card) -> float | int:
+        return parse_card_rating(await card.inner_text())
+
+    async def find_card_by_rating(self, target):
+        for card in await self.extract_cards():
+            if card.rating == target:
+                return self.cards_locator().nth(card.index)
+
+        return None
+
+    async def find_card_by_price(self, target):
+        for card in await self.extract_cards():
+            if card.price == target:
+                return self.cards_locator().nth(card.index)
+
+        return None
+
+    async def get_max_card_rating_in_page(self) -> tuple[float | int, int]:
+        cards = await self.extract_cards()
+        highest_rating = max((card.rating for card in cards), default=-1)
+
+        return highest_rating, len(cards)
+
+    async def get_card_price(self, card) -> float:
+        return parse_card_price(await card.inner_text())
+
+    async def get_min_card_price_in_page(self) -> tuple[float | int, int]:
+        cards = await self.extract_cards()
+        lowest_price = min((card.price for card in cards), default=float("inf"))
+
+        return lowest_price, len(cards)
+
+    async def pagination_links(self) -> dict[int, str]:
+        return dict(await self.page.evaluate(PAGINATION_LINKS_SCRIPT))
+
+    async def next_page_url(self) -> str | None:
+        if not await self.next_page_button().is_enabled():
+            return None
+
+        return urljoin(self.page.url, await self.next_page_button().get_attribute("href"))
+
+    async def iter_pages(self, prefetch: bool = False) -> AsyncIterator[list[CardRecord]]:
+        if prefetch:
+            async with aclosing(self.iter_pages_prefetched()) as pages:
+                async for cards in pages:
+                    yield cards
+            return
+
+        # Go back to the first page (if not already on it)
+        if await self.first_page_button().is_enabled():
+            await self.go_back_to_first_page()
+
+        # Loop through the pages until there are no more pages
+        while True:
+            cards = await self.extract_cards()
+
+            logging.debug(f"Done page {self.page_number}, read {len(cards)} cards.")
+
+            yield cards
+
+            # If there are more pages, go to the next page
+            if await self.next_page_button().is_enabled():
+                await self.click_next_page()
+            else:
+                break
+
+    async def iter_pages_prefetched(self) -> AsyncIterator[list[CardRecord]]:
+        # Go back to the first page (if not already on it)
+        if await self.first_page_button().is_enabled():
+            await self.go_back_to_first_page()
+
+        reader = self
+        loader = AsyncSearchResultsPage(await self.page.context.new_page())
+
+        try:
+            while True:
+                await reader.wait_until_loaded()
+                next_url = await reader.next_page_url()
+
+                # Start loading the next page before reading this one
+                if next_url is not None:
+                    await loader.start_loading(next_url, reader.page_number + 1)
+
+                cards = await reader.extract_cards()
+
+                logging.debug(f"Done page {reader.page_number}, read {len(cards)} cards.")
+
+                yield cards
+
+                if next_url is None:
+                    break
+
+                reader, loader = loader, reader
+        finally:
+            await (loader if reader is self else reader).page.close()
+
+            # When stopped early, this page may still be loading the next page: let it get there
+            await self.wait_until_loaded()
+
+    async def iter_cards(
+        self, predicate: Callable[[CardRecord], bool] | None = None, prefetch: bool = False
+    ) -> AsyncIterator[CardRecord]:
+        async with aclosing(self.iter_pages(prefetch)) as pages:
+            async for cards in pages:
+                for card in cards:
+                    if predicate is None or predicate(card):
+                        yield card
+
+    async def scan(self, max_tabs: int = 1, prefetch: bool = False) -> ResultsScan:
+        if max_tabs > 1:
+            return await self.scan_in_tabs(max_tabs)
+
+        results_scan = ResultsScan()
+
+        async for cards in self.iter_pages(prefetch):
+            results_scan.add(cards)
+
+        return results_scan
+
+    async def scan_in_tabs(self, max_tabs: int = SCAN_MAX_TABS) -> ResultsScan:
+        """
+        Reads all the cards in all the results pages, reading up to max_tabs pages concurrently
+        in other tabs of the browser context. See SearchResultsPage.scan_in_tabs.
+
+        Args:
+            max_tabs (int, optional): The number of results pages to load at the same time.
+
+        Returns:
+            ResultsScan: The cards of all the pages.
+        """
+
+        # Go back to the first page (if not already on it)
+        if await self.first_page_button().is_enabled():
+            await self.go_back_to_first_page()
+
+        cards_by_page = {1: await self.extract_cards()}
+        page_urls = {1: self.page.url, **await self.pagination_links()}
+
+        tabs = []
+
+        async def read_page(tab: AsyncSearchResultsPage, number: int):
+            tab.page_number = number
+            tab._stale_first_card_url = None
+            await tab.page.goto(page_urls[number], wait_until="commit")
+
+            cards_by_page[number] = await tab.extract_cards()
+
+            for link_number, link_url in (await tab.pagination_links()).items():
+                page_urls.setdefault(link_number, link_url)
+
+            logging.debug(f"Done page {number}, read {len(cards_by_page[number])} cards.")
+
+        try:
+            while True:
+                pages_to_load = sorted(
+                    number for number in page_urls if number not in cards_by_page
+                )[:max_tabs]
+
+                if not pages_to_load:
+                    break
+
+                # Open more tabs if needed, and reuse the ones we already have
+                while len(tabs) < len(pages_to_load):
+                    tabs.append(AsyncSearchResultsPage(await self.page.context.new_page()))
+
+                await asyncio.gather(
+                    *(read_page(tab, number) for tab, number in zip(tabs, pages_to_load))
+                )
+        finally:
+            for tab in tabs:
+                await tab.page.close()
+
+        results_scan = ResultsScan()
+
+        for number in sorted(cards_by_page):
+            results_scan.add(cards_by_page[number])
+
+        return results_scan
+
+    async def go_to_card(self, card: CardRecord):
+        if card.page != self.page_number and card.page_url:
+            self._stale_first_card_url = None
+            await self.page.goto(card.page_url)
+            self.page_number = card.page
+        elif card.page < self.page_number:
+            await self.go_back_n_pages(self.page_number - card.page)
+        else:
+            for _ in range(card.page - self.page_number):
+                await self.click_next_page()
+
+        return self.cards_locator().nth(card.index)
+
+    async def open_card(self, card: CardRecord) -> Page:
+        if card.url:
+            new_page = await self.page.context.new_page()
+            await new_page.goto(card.url)
+
+            return new_page
+
+        card_locator = await self.go_to_card(card)
+
+        async with self.page.context.expect_page() as new_page_info:
+            await card_locator.click()
+
+        return await new_page_info.value
+
+    async def find_highest_rated(
+        self, click: bool = False, results_scan: ResultsScan | None = None
+    ) -> tuple[int | float, str, Page | None]:
+        if results_scan is None:
+            results_scan = ResultsScan()
+
+            # Closed right away when stopping early, so the prefetch tab doesn't wait for the garbage collector
+            async with aclosing(self.iter_cards(prefetch=True)) as cards:
+                async for card in cards:
+                    results_scan.add([card])
+
+                    if card.rating >= MAX_RATING:
+                        break
+
+        best_card = self.highest_rated_card(results_scan)
+        current_page = await self.open_card(best_card) if click else None
+
+        return best_card.rating, best_card.text, current_page
+
+    async def find_cheapest(
+        self, click: bool = False, results_scan: ResultsScan | None = None
+    ) -> tuple[int | float, str, Page | None]:
+        if results_scan is None:
+            results_scan = await self.scan(prefetch=True)
+
+        best_card = self.cheapest_card(results_scan)
+        current_page = await self.open_card(best_card) if click else None
+
+        return best_card.price, best_card.text, current_page
+
+    async def rank(
+        self, k: int = 5, min_reviews: int = MIN_REVIEWS, results_scan: ResultsScan | None = None
+    ) -> dict[str, list[CardRecord]]:
+        if results_scan is not None:
+            return results_scan.rank(k, min_reviews)
+
+        ranker = Ranker(k, min_reviews)
+
+        async for cards in self.iter_pages(prefetch=True):
+            ranker.add(cards)
+
+        return ranker.results()
+
+    async def read_details(self, card: CardRecord) -> BookingSnapshot | None:
+        # Polls the booking panel until it shows the total price, like SearchResultsPage.iter_details
+        tab = AsyncAptDetails(await self.page.context.new_page())
+        deadline = time.monotonic() + DETAILS_LOAD_TIMEOUT / 1000
+
+        try:
+            await tab.page.goto(card.url, wait_until="commit")
+
+            while True:
+                snapshot = await tab.read_snapshot()
+
+                if snapshot is not None and snapshot.total_price is not None:
+                    return snapshot
+
+                if time.monotonic() > deadline:
+                    logging.warning(f"Timed out reading the details page of {card.url}")
+                    return snapshot
+
+                await asyncio.sleep(DETAILS_POLL_INTERVAL / 1000)
+        finally:
+            await tab.page.close()
+
+    async def iter_details(
+        self, cards: Iterable[CardRecord], max_tabs: int = DETAILS_MAX_TABS
+    ) -> AsyncIterator[tuple[CardRecord, BookingSnapshot | None]]:
+        semaphore = asyncio.Semaphore(max_tabs)
+
+        async def read(card: CardRecord):
+            async with semaphore:
+                return card, await self.read_details(card)
+
+        tasks = []
+
+        for card in cards:
+            if card.url:
+                tasks.append(asyncio.ensure_future(read(card)))
+            else:
+                logging.warning(f"Skipping card {card.index} of page {card.page}, it has no listing link.")
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+            # Let the cancelled reads close their tabs
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def rank_by_total(
+        self, cards: Iterable[CardRecord], max_tabs: int = DETAILS_MAX_TABS
+    ) -> list[tuple[CardRecord, BookingSnapshot]]:
+        cards = list(cards)
+        position = {id(card): i for i, card in enumerate(cards)}
+
+        details = [
+            (card, snapshot)
+            async for card, snapshot in self.iter_details(cards, max_tabs)
+            if snapshot is not None and snapshot.total_price is not None
+        ]
+
+        return sorted(details, key=lambda detail: (detail[1].total_price, position[id(detail[0])]))
+
+    # Verification
+
+    async def verify_search_location(self, location):
+        await expect(self.results_location()).to_contain_text(location)
+
+    async def verify_results_heading_location(self, location):
+        await expect(self.results_heading_location()).to_contain_text(location)
+
+    async def verify_search_dates(self, check_in_date: datetime, check_out_date: datetime):
+        await self.results_dates().wait_for(state="visible")
+        lines = (await self.results_dates().inner_text()).split("\n")
+        checkin, checkout = parse_dates(lines[1])
+
+        assert checkin == check_in_date, "Check-in date does not match"
+        assert checkout == check_out_date, "Check-out date does not match"
+
+    async def verify_search_guests(self, num_of_adults):
+        await expect(self.results_guests()).to_contain_text(f"{num_of_adults} guests")
+
+    async def verify_results(self, location, check_in_date, check_out_date, num_of_adults):
+        await self.verify_search_location(location)
+        await self.verify_results_heading_location(location)
+        await self.verify_search_dates(check_in_date, check_out_date)
+        await self.verify_search_guests(num_of_adults)
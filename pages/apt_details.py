@@ -1,16 +1,37 @@
 from playwright.sync_api import Page
+from playwright.async_api import Page as AsyncPage
 from datetime import datetime
 import logging
 import re
-
-
-class AptDetails:
+from utils.records import BookingSnapshot
+from utils.util import parse_total_price, parse_trip_dates, parse_trip_guests
+
+# Reads the dates, guests, prices and reserve button of the booking panel in one round trip
+BOOKING_SNAPSHOT_SCRIPT = """
+(panel) => {
+    const buttons = [...panel.querySelectorAll("button")];
+    const dates = panel.querySelector('button[aria-label^="Change dates;"]');
+    const guests = buttons.find((button) => /\\d+\\s+guests/.test(button.innerText));
+    const reserve = buttons.find((button) => /^Reserve\\b/.test(button.innerText.trim()));
+    const total = [...panel.querySelectorAll("div")].find((div) => /^Total/.test(div.innerText));
+
+    return {
+        panelText: panel.innerText,
+        datesText: dates ? dates.innerText : null,
+        guestsText: guests ? guests.innerText : null,
+        totalText: total ? total.innerText : null,
+        reserveEnabled: !!reserve && !reserve.disabled && reserve.getAttribute("aria-disabled") !== "true",
+    };
+}
+"""
+
+
+class AptDetailsBase:
     """
-    Class representing the apartment details page on Airbnb,
-    where the user can make a reservation.
+    The locators of the apartment details page, shared by the sync and async page objects.
     """
 
-    def __init__(self, page: Page):
+    def __init__(self, page: Page | AsyncPage):
         self.page = page
 
     # Locators
@@ -33,22 +54,39 @@ class AptDetails:
             .first
         )
 
+    def booking_panel(self):
+        return self.page.locator('div[data-section-id="BOOK_IT_SIDEBAR"]').first
+
+    def booking_panel_total(self):
+        # The "Total" row of the booking panel, once it shows a price (it comes after the dates and guests)
+
+        return self.booking_panel().locator("div").filter(has_text=re.compile(r"^Total\D*\d")).first
+
     def reserve_button(self):
         return self.page.get_by_role("button", name="Reserve")
 
     def translation_header(self):
         return self.page.get_by_role("heading", name="Translation on")
 
+
+class AptDetails(AptDetailsBase):
+    """
+    Class representing the apartment details page on Airbnb,
+    where the user can make a reservation.
+    """
+
     # Actions
 
     def click_close_translation_popup_button(self):
         """
-        Attempt to click the close button on the translation popup if it appears.
+        Closes the translation popup if it is showing, without waiting for it to show up.
+
+        When it shows up later, the interstitial handlers close it (see utils/interstitials.py).
         """
 
         try:
-            self.translation_header().wait_for(state="visible")
-            self.close_translation_popup_button().click()
+            if self.translation_header().is_visible():
+                self.close_translation_popup_button().click()
         except Exception as e:
             # Don't raise an error if the button is not found or clickable
             logging.debug("Failed to close translation popup: %s", str(e))
@@ -63,17 +101,7 @@ class AptDetails:
 
         self.trip_dates().wait_for(state="visible")
 
-        dates_text = self.trip_dates().inner_text().split("\n")
-
-        # The dates are in the format "month/day/year"
-        check_in_date = dates_text[1]
-        check_out_date = dates_text[3]
-
-        # Convert the dates to datetime objects
-        check_in_date_dt = datetime.strptime(check_in_date, "%m/%d/%Y")
-        check_out_date_dt = datetime.strptime(check_out_date, "%m/%d/%Y")
-
-        return check_in_date_dt, check_out_date_dt
+        return parse_trip_dates(self.trip_dates().inner_text())
 
     def get_number_of_guests(self):
         """
@@ -88,17 +116,7 @@ class AptDetails:
 
         self.trip_guests().wait_for(state="visible")
 
-        guests_text = self.trip_guests().inner_text()
-        guests_regex = r"GUESTS\s+(\d+)\s+guests"  # For example: "GUESTS 2 guests"
-
-        match = re.search(guests_regex, guests_text)
-
-        if match:
-            number_of_guests = int(match.group(1))
-        else:
-            raise ValueError("Could not find the number of guests in the text.")
-
-        return number_of_guests
+        return parse_trip_guests(self.trip_guests().inner_text())
 
     def get_total_price(self):
         """
@@ -113,17 +131,38 @@ class AptDetails:
 
         self.total_price().wait_for(state="visible")
 
-        total_text = self.total_price().inner_text()
-        total_regex = r"Total[^\d]*([\d,]*)[^\d]*"
+        return parse_total_price(self.total_price().inner_text())
+
+    def snapshot(self) -> BookingSnapshot:
+        """
+        Reads the booking panel once it shows its total price, with a single evaluation scoped to the panel.
 
-        match = re.search(total_regex, total_text)
+        Returns:
+            BookingSnapshot: The dates, guests, prices and reserve button state of the panel.
+
+        Raises:
+            ValueError: If the dates or the number of guests could not be found in the panel.
+        """
 
-        if match:
-            total_price = int(match.group(1).replace(",", ""))
-        else:
-            raise ValueError("Could not find the total price in the text.")
+        self.booking_panel_total().wait_for(state="visible")
 
-        return total_price
+        return BookingSnapshot.from_raw(self.booking_panel().evaluate(BOOKING_SNAPSHOT_SCRIPT))
+
+    def read_snapshot(self) -> BookingSnapshot | None:
+        """
+        Reads the booking panel if it is showing, without waiting for it.
+
+        Returns:
+            BookingSnapshot | None: The snapshot, or None if the panel isn't showing its dates and guests yet.
+        """
+
+        if not self.booking_panel().is_visible():
+            return None
+
+        try:
+            return BookingSnapshot.from_raw(self.booking_panel().evaluate(BOOKING_SNAPSHOT_SCRIPT))
+        except ValueError:
+            return None
 
     def click_reserve_button(self):
         self.reserve_button().click()
@@ -1,21 +1,19 @@
 from playwright.sync_api import Page
+from playwright.async_api import Page as AsyncPage
+from utils.search_query import SearchQuery
 from utils.util import format_date_to_airbnb
 from datetime import datetime
 
 
-class HomePage:
+class HomePageBase:
     """
-    This class represents the home page of the Airbnb website.
+    The locators of the home page, shared by the sync and async page objects.
     """
 
-    def __init__(self, page: Page, base_url):
+    def __init__(self, page: Page | AsyncPage, base_url):
         self.page = page
         self.base_url = base_url
 
-    def goto(self):
-        self.page.context.set_extra_http_headers({"Accept-Language": "en-US"})
-        self.page.goto(self.base_url)
-
     # Locators
 
     def search_input(self):
@@ -43,6 +41,16 @@ class HomePage:
     def search_button(self):
         return self.page.get_by_test_id("structured-search-input-search-button")
 
+
+class HomePage(HomePageBase):
+    """
+    This class represents the home page of the Airbnb website.
+    """
+
+    def goto(self):
+        self.page.context.set_extra_http_headers({"Accept-Language": "en-US"})
+        self.page.goto(self.base_url)
+
     # Actions
 
     def click_search_input(self):
@@ -80,6 +88,9 @@ class HomePage:
     def click_search_button(self):
         self.search_button().click()
 
+    def goto_results(self, query: SearchQuery):
+        self.page.goto(query.url(self.base_url))
+
     def search_apartments(
         self,
         location: str,
@@ -107,3 +118,30 @@ class HomePage:
 
         # Search for available apartments
         self.click_search_button()
+
+    def search(self, query: SearchQuery, mode: str = "url"):
+        """
+        Searches for apartments, straight through the results URL or by filling the search form.
+
+        Args:
+            query (SearchQuery): The parameters of the search.
+            mode (str, optional): "url" to load the results directly (one navigation),
+                                  or "ui" to fill the search form of the home page. Defaults to "url".
+
+        Raises:
+            ValueError: If the mode is unknown.
+        """
+
+        if mode == "url":
+            self.goto_results(query)
+        elif mode == "ui":
+            self.goto()
+            self.search_apartments(
+                query.location,
+                query.check_in_date,
+                query.check_out_date,
+                query.num_of_adults,
+                query.num_of_children,
+            )
+        else:
+            raise ValueError(f"Unknown search mode: {mode}")
@@ -1,10 +1,47 @@
 import re
 from playwright.sync_api import Page, Locator
+from playwright.async_api import Page as AsyncPage
+from utils.layouts import detect_layout
 from utils.util import parse_dates, parse_guests
 
 
-class ReservationPage:
-    def __init__(self, page: Page):
+def check_reservation_details(
+    dates_text, guests_text, exp_adults, exp_children, exp_check_in, exp_check_out
+):
+    """
+    Checks the dates and guests texts of a reservation summary against the expected values.
+
+    Args:
+        dates_text (str): The dates text, for example "May 1 – 5, 2025".
+        guests_text (str): The guests text, for example "2 adults, 1 child" or "3 guests".
+        exp_adults (int): The expected number of adults.
+        exp_children (int): The expected number of children.
+        exp_check_in (datetime): The expected check-in date.
+        exp_check_out (datetime): The expected check-out date.
+    """
+
+    # Assert dates
+    chek_in_date, check_out_date = parse_dates(dates_text)
+    assert chek_in_date == exp_check_in, "Mismatch in check-in date"
+    assert check_out_date == exp_check_out, "Mismatch in checkout date"
+
+    # Assert guests
+    total_guests, adults, children = parse_guests(guests_text)
+    if adults == -1 and children == -1:
+        assert (
+            total_guests == exp_adults + exp_children
+        ), "Mismatch in total guests number"
+    else:
+        assert adults == exp_adults, "Mismatch in number of adults"
+        assert children == exp_children, "Mismatch in number of children"
+
+
+class ReservationPageBase:
+    """
+    The locators of the reservation page, shared by the sync and async page objects.
+    """
+
+    def __init__(self, page: Page | AsyncPage):
         self.page = page
 
     # Locators
@@ -24,6 +61,34 @@ class ReservationPage:
     def reservation_summary(self):
         return self.page.get_by_text(re.compile(r"Trip details.*Change"))
 
+    def header(self):
+        return self.page.get_by_role(
+            "heading", name=re.compile("Request to book|Confirm and pay")
+        )
+
+    # Layouts, by the locator that tells them apart, in order of priority (see detect_layout)
+
+    def trip_details_layouts(self) -> dict[str, Locator]:
+        # 1. The trip details summary ("Trip details ... Change")
+        # 2. The dates and guests rows to the left ("Dates ... Edit", "Guests ... Edit")
+        return {"summary": self.reservation_summary(), "left": self.left_dates_locator()}
+
+    def phone_layouts(self) -> dict[str, Locator]:
+        # 1. The phone number input is already displayed (with the "Continue" button at the bottom)
+        # 2. The "Continue" button, that when clicked asks for the phone number
+        return {"inline": self.phone_number_input(), "continue": self.continue_button()}
+
+    # Parsing
+
+    def trip_details_from_summary(self, summary_text: str) -> tuple[str, str]:
+        lines = summary_text.split("\n")
+        return lines[1], lines[2]
+
+    def trip_details_from_rows(self, dates_text: str, guests_text: str) -> tuple[str, str]:
+        return dates_text.split("\n")[1], guests_text.split("\n")[1]
+
+
+class ReservationPage(ReservationPageBase):
     # Actions
 
     def click_continue_button(self):
@@ -33,18 +98,26 @@ class ReservationPage:
         self.phone_number_input().fill(phone_number)
 
     def signup_with_phone(self, phone_number):
-        # There are two kinds of reservation pages:
-        # 1. The one with the "Continue" button to the left, that when clicked asks for phone number
-        # 2. The one with the "Continue" button at the bottom, alreasy displaying phone number input
-        if not self.phone_number_input().is_visible():
+        # See phone_layouts for the two kinds of reservation pages
+        if detect_layout(self.phone_layouts()) == "continue":
             self.click_continue_button()
             self.phone_number_input().wait_for(state="visible")
 
         self.fill_phone_number(phone_number)
 
-    def header(self):
-        return self.page.get_by_role(
-            "heading", name=re.compile("Request to book|Confirm and pay")
+    def read_trip_details(self) -> tuple[str, str]:
+        """
+        Reads the dates and guests texts of the reservation, in whichever layout the page shows up.
+
+        Returns:
+            tuple[str, str]: The dates text and the guests text.
+        """
+
+        if detect_layout(self.trip_details_layouts()) == "summary":
+            return self.trip_details_from_summary(self.reservation_summary().inner_text())
+
+        return self.trip_details_from_rows(
+            self.left_dates_locator().inner_text(), self.left_guests_locator().inner_text()
         )
 
     # Validations
@@ -60,30 +133,11 @@ class ReservationPage:
             exp_check_out (datetime): The expected check-out date.
         """
 
+        # Make sure this is the reservation page before reading it
         self.header().wait_for(state="visible")
 
-        if self.reservation_summary().is_visible():
-            summary_text = self.reservation_summary().inner_text()
-
-            lines = summary_text.split("\n")
-
-            dates_text = lines[1]
-            guests_text = lines[2]
-        else:
-            guests_text = self.left_guests_locator().inner_text().split("\n")[1]
-            dates_text = self.left_dates_locator().inner_text().split("\n")[1]
-
-        # Assert dates
-        chek_in_date, check_out_date = parse_dates(dates_text)
-        assert chek_in_date == exp_check_in, "Mismatch in check-in date"
-        assert check_out_date == exp_check_out, "Mismatch in checkout date"
-
-        # Assert guests
-        total_guests, adults, children = parse_guests(guests_text)
-        if adults == -1 and children == -1:
-            assert (
-                total_guests == exp_adults + exp_children
-            ), "Mismatch in total guests number"
-        else:
-            assert adults == exp_adults, "Mismatch in number of adults"
-            assert children == exp_children, "Mismatch in number of children"
+        dates_text, guests_text = self.read_trip_details()
+
+        check_reservation_details(
+            dates_text, guests_text, exp_adults, exp_children, exp_check_in, exp_check_out
+        )
@@ -1,22 +1,146 @@
 from playwright.sync_api import Page, expect
+from playwright.async_api import Page as AsyncPage
 from datetime import datetime
 from utils.util import format_date_to_airbnb
 import logging
-import re
-from conftest import CARD_LOAD_TIMEOUT
-from utils.util import parse_dates
+import time
+from collections import deque
+from typing import Callable, Iterable, Iterator
+from urllib.parse import urljoin
+from conftest import (
+    CARD_LOAD_TIMEOUT,
+    CARD_SETTLE_TIME,
+    DETAILS_LOAD_TIMEOUT,
+    DETAILS_MAX_TABS,
+    DETAILS_POLL_INTERVAL,
+    SCAN_MAX_TABS,
+)
+from pages.apt_details import AptDetails
+from utils.listing_capture import ListingCapture
+from utils.listing_store import ListingStore
+from utils.ranking import MIN_REVIEWS, Ranker
+from utils.records import BookingSnapshot, CardRecord
+from utils.results_scan import ResultsScan
+from utils.search_query import SearchQuery
+from utils.util import parse_card_price, parse_card_rating, parse_dates
 
 logging.basicConfig(level=logging.INFO)
 
-
-class SearchResultsPage:
+# The highest rating a listing can have, no card can beat a card rated this
+MAX_RATING = 5.0
+
+# A hash of the listing links and texts of the cards, to tell whether a results page changed since
+# an earlier scan (textContent doesn't need the layout, unlike innerText)
+FINGERPRINT_SCRIPT = """
+cards => {
+    let hash = 0;
+    for (const card of cards) {
+        const link = card.querySelector("a[href]");
+        const content = (link ? link.href.split("?")[0] : "") + card.textContent;
+        for (let i = 0; i < content.length; i++) {
+            hash = (Math.imul(31, hash) + content.charCodeAt(i)) | 0;
+        }
+    }
+    return `${cards.length}:${(hash >>> 0).toString(16)}`;
+}
+"""
+
+# Collects the text, listing link and position of every card in one round trip
+EXTRACT_CARDS_SCRIPT = """
+cards => cards.map((card, index) => {
+    const link = card.querySelector("a[href]");
+    return { index: index, text: card.innerText, url: link ? link.href : null };
+})
+"""
+
+# Fingerprints the cards (FINGERPRINT_SCRIPT), and extracts them too (EXTRACT_CARDS_SCRIPT) unless
+# the fingerprint is the one given, so a changed page takes a single round trip
+FINGERPRINT_AND_EXTRACT_SCRIPT = f"""
+(cards, knownFingerprint) => {{
+    const fingerprint = ({FINGERPRINT_SCRIPT})(cards);
+    const extracted = fingerprint === knownFingerprint ? null : ({EXTRACT_CARDS_SCRIPT})(cards);
+    return {{ fingerprint: fingerprint, cards: extracted }};
+}}
+"""
+
+# Collects the links to the numbered results pages shown in the pagination bar
+PAGINATION_LINKS_SCRIPT = """
+() => Array.from(document.querySelectorAll("nav a[href]"))
+    .filter(link => /^\\d+$/.test(link.innerText.trim()))
+    .map(link => [parseInt(link.innerText.trim(), 10), link.href])
+"""
+
+# Starts loading a URL in the page without waiting for its response, so the requests of several
+# tabs are in flight at the same time. The location is set after the evaluation returns,
+# so the navigation doesn't destroy the context the evaluation runs in.
+START_LOADING_SCRIPT = """
+url => { setTimeout(() => { window.location.href = url; }); }
+"""
+
+# Resolves with the number of cards once the results grid has settled: there is at least one card,
+# the grid is not the one of the previous page anymore, and the number of cards did not change
+# for a while. Resolves with whatever is there when the timeout expires.
+WAIT_FOR_CARDS_SCRIPT = """
+([selector, staleFirstUrl, settleTime, timeout]) => new Promise(resolve => {
+    const cards = () => document.querySelectorAll(selector);
+    const firstUrl = () => {
+        const first = cards()[0];
+        const link = first ? first.querySelector("a[href]") : null;
+        return link ? link.href : null;
+    };
+    const ready = () => cards().length > 0 && (staleFirstUrl === null || firstUrl() !== staleFirstUrl);
+
+    let lastCount = -1;
+    let settleTimer = null;
+
+    const finish = () => {
+        observer.disconnect();
+        clearTimeout(settleTimer);
+        clearTimeout(deadline);
+        resolve(cards().length);
+    };
+
+    const check = () => {
+        if (!ready()) return;
+        const count = cards().length;
+        if (count !== lastCount) {
+            lastCount = count;
+            clearTimeout(settleTimer);
+            settleTimer = setTimeout(finish, settleTime);
+        }
+    };
+
+    const observer = new MutationObserver(check);
+    observer.observe(document.documentElement, { childList: true, subtree: true });
+    const deadline = setTimeout(finish, timeout);
+    check();
+})
+"""
+
+
+class SearchResultsPageBase:
     """
-    This class represents the search results page on Airbnb.
+    The locators and parsing of the search results page,
+    shared by the sync and async page objects.
     """
 
-    def __init__(self, page: Page):
+    CARDS_SELECTOR = 'div[data-testid="card-container"]'
+
+    def __init__(self, page: Page | AsyncPage):
         self.page = page
 
+        # The link of the first card in the last extracted page, and the one of the page we left.
+        # Used to tell the new results grid apart from the old one after changing pages.
+        self._first_card_url = None
+        self._stale_first_card_url = None
+
+        # The number of the results page we are at, as far as we know
+        self.page_number = 1
+
+        # The URL the page was at when it started loading another results page (see start_loading),
+        # None when no load is pending
+        self._loading_from = None
+
     # Locators
     def results_location(self):
         return self.page.get_by_test_id("little-search-location")
@@ -40,17 +164,82 @@ class SearchResultsPage:
         return self.page.get_by_role("link", name="1", exact=True)
 
     def cards_locator(self):
-        return self.page.locator('div[data-testid="card-container"]')
+        return self.page.locator(self.CARDS_SELECTOR)
+
+    # Parsing
+
+    def wait_for_cards_args(self) -> list:
+        return [self.CARDS_SELECTOR, self._stale_first_card_url, CARD_SETTLE_TIME, CARD_LOAD_TIMEOUT]
+
+    def to_cards(self, raw_cards: list[dict]) -> list[CardRecord]:
+        """
+        Parses the raw cards extracted from the current results page.
+
+        Args:
+            raw_cards (list[dict]): The cards, as returned by EXTRACT_CARDS_SCRIPT.
+
+        Returns:
+            list[CardRecord]: The parsed cards.
+        """
+
+        cards = [
+            CardRecord.from_raw(raw_card, self.page_number, self.page.url)
+            for raw_card in raw_cards
+        ]
+
+        self._first_card_url = cards[0].url if cards else None
+
+        return cards
+
+    def highest_rated_card(self, results_scan: ResultsScan) -> CardRecord:
+        best_card = results_scan.highest_rated()
+
+        if best_card is None:
+            logging.error("No card with the highest rating was found.")
+            raise ValueError("No card with the highest rating was found.")
+
+        return best_card
+
+    def cheapest_card(self, results_scan: ResultsScan) -> CardRecord:
+        best_card = results_scan.lowest_priced()
+
+        if best_card is None:
+            logging.error("No card with the lowest price was found.")
+            raise ValueError("No card with the lowest price was found.")
+
+        return best_card
+
+
+class SearchResultsPage(SearchResultsPageBase):
+    """
+    This class represents the search results page on Airbnb.
+    """
 
     # Actions
     def click_results_dates(self):
         self.results_dates().click()
 
+    def change_page(self, button):
+        """
+        Clicks a pagination button and waits until the URL changes.
+
+        Args:
+            button: The pagination link to click.
+        """
+
+        current_url = self.page.url
+        self._stale_first_card_url = self._first_card_url
+
+        button.click()
+        self.page.wait_for_url(lambda url: url != current_url)
+
     def click_next_page(self):
-        self.next_page_button().click()
+        self.change_page(self.next_page_button())
+        self.page_number += 1
 
     def click_previous_page(self):
-        self.previous_page_button().click()
+        self.change_page(self.previous_page_button())
+        self.page_number -= 1
 
     def go_back_n_pages(self, n):
         for _ in range(n):
@@ -61,66 +250,89 @@ class SearchResultsPage:
                 break
 
     def go_back_to_first_page(self):
-        self.first_page_button().click()
+        self.change_page(self.first_page_button())
+        self.page_number = 1
 
-    def get_card_rating(self, card) -> float | int:
+    def start_loading(self, url: str, page_number: int):
         """
-        Extracts the rating from a card element.
+        Starts loading a results page, without waiting for the server to answer.
+
+        Call wait_until_loaded before reading the page.
 
         Args:
-            card: The card element containing the rating information.
+            url (str): The URL of the results page.
+            page_number (int): The number of the results page.
+        """
 
-        Returns:
-            float: The extracted rating as a float if found, otherwise -1.
+        self.page_number = page_number
+        self._stale_first_card_url = None
+        self._loading_from = self.page.url
+
+        self.page.evaluate(START_LOADING_SCRIPT, url)
+
+    def wait_until_loaded(self):
+        """
+        Waits until the results page started by start_loading replaces the previous one (if one was started).
         """
 
-        rating_regex = re.compile(r"(\d\.\d+) out of 5 average rating")
+        if self._loading_from is None:
+            return
 
-        # Check if it has a rating
-        match_rating = re.search(rating_regex, card.inner_text())
+        loading_from = self._loading_from
+        self.page.wait_for_url(lambda url: url != loading_from, wait_until="commit")
+        self._loading_from = None
 
-        if match_rating:
-            rating = float(match_rating.group(1))
+    def wait_for_cards(self) -> int:
+        """
+        Waits for the results grid to settle.
 
-            return rating
+        Returns:
+            int: The number of cards in the page (0 if no card showed up in time).
+        """
 
-        return -1
+        card_count = self.page.evaluate(WAIT_FOR_CARDS_SCRIPT, self.wait_for_cards_args())
+        self._stale_first_card_url = None
 
-    def find_card_by_rating(self, target):
-        card_index = 0
+        return card_count
 
-        while True:
-            try:
-                card = self.cards_locator().nth(card_index)
-                card.wait_for(state="visible", timeout=CARD_LOAD_TIMEOUT)
+    def extract_cards(self) -> list[CardRecord]:
+        """
+        Extracts all the cards in the current results page with a single evaluation in the browser.
 
-                rating = self.get_card_rating(card)
+        Returns:
+            list[CardRecord]: The parsed cards, in the order they appear in the page.
+        """
 
-                if rating == target:
-                    return card
+        if self.wait_for_cards() == 0:
+            logging.debug("No cards were found in the page.")
+            return []
 
-                card_index += 1
-            except Exception as e:
-                break
+        return self.to_cards(self.cards_locator().evaluate_all(EXTRACT_CARDS_SCRIPT))
 
-        return None
+    def get_card_rating(self, card) -> float | int:
+        """
+        Extracts the rating from a card element.
 
-    def find_card_by_price(self, target):
-        card_index = 0
+        Args:
+            card: The card element containing the rating information.
 
-        while True:
-            try:
-                card = self.cards_locator().nth(card_index)
-                card.wait_for(state="visible", timeout=CARD_LOAD_TIMEOUT)
+        Returns:
+            float: The extracted rating as a float if found, otherwise -1.
+        """
 
-                price = self.get_card_price(card)
+        return parse_card_rating(card.inner_text())
 
-                if price == target:
-                    return card
+    def find_card_by_rating(self, target):
+        for card in self.extract_cards():
+            if card.rating == target:
+                return self.cards_locator().nth(card.index)
 
-                card_index += 1
-            except Exception as e:
-                break
+        return None
+
+    def find_card_by_price(self, target):
+        for card in self.extract_cards():
+            if card.price == target:
+                return self.cards_locator().nth(card.index)
 
         return None
 
@@ -132,24 +344,10 @@ class SearchResultsPage:
             tuple: A tuple containing the highes rating in the page, and the total number of cards in the page.
         """
 
-        card_index = 0
-        highest_rating = -1
-
-        while True:
-            try:
-                card = self.cards_locator().nth(card_index)
-                card.wait_for(state="visible", timeout=CARD_LOAD_TIMEOUT)
-
-                rating = self.get_card_rating(card)
+        cards = self.extract_cards()
+        highest_rating = max((card.rating for card in cards), default=-1)
 
-                if rating > highest_rating:
-                    highest_rating = rating
-
-                card_index += 1
-            except Exception as e:
-                break
-
-        return highest_rating, card_index
+        return highest_rating, len(cards)
 
     def get_card_price(self, card) -> float:
         """
@@ -162,179 +360,602 @@ class SearchResultsPage:
             float: The extracted price as a float if found, otherwise infinity.
         """
 
-        # The line in which the price is displayed
-        price_line_regex = re.compile(r"([^\n]+)\n(?=Show price breakdown)")
+        return parse_card_price(card.inner_text())
 
-        # The price itself
-        price_regex = re.compile(r"[^\d]*(\d[\d,\.]*)")
+    def get_min_card_price_in_page(self) -> tuple[float | int, int]:
+        """
+        Finds the cheapest card in the page.
 
-        # Get the price line
-        match_price_line = re.search(price_line_regex, card.inner_text())
+        Returns:
+            tuple: A tuple containing the lowest price in the page, and the total number of cards in the page.
+        """
 
-        if match_price_line:
-            # Extract the price from the line
-            match_price = re.search(price_regex, match_price_line.group(1))
+        cards = self.extract_cards()
+        lowest_price = min((card.price for card in cards), default=float("inf"))
 
-            if match_price:
-                # Convert the price to a float
-                price = float(match_price.group(1).replace(",", ""))
+        return lowest_price, len(cards)
 
-                return price
+    def pagination_links(self) -> dict[int, str]:
+        """
+        Gets the links to the results pages shown in the pagination bar.
 
-        return float("inf")
+        Returns:
+            dict[int, str]: The URL of every page number in the bar.
+        """
 
-    def get_min_card_price_in_page(self) -> tuple[float | int, int]:
+        return dict(self.page.evaluate(PAGINATION_LINKS_SCRIPT))
+
+    def next_page_url(self) -> str | None:
         """
-        Finds the cheapest card in the page.
+        Gets the URL of the next results page.
 
         Returns:
-            tuple: A tuple containing the lowest price in the page, and the total number of cards in the page.
+            str | None: The URL, or None if this is the last page.
         """
 
-        card_index = 0
-        lowest_price = float("inf")
+        if not self.next_page_button().is_enabled():
+            return None
+
+        return urljoin(self.page.url, self.next_page_button().get_attribute("href"))
+
+    def iter_pages(
+        self, capture: ListingCapture | None = None, prefetch: bool = False
+    ) -> Iterator[list[CardRecord]]:
+        """
+        Reads the results pages one at a time, starting at the first page.
+
+        The next page is loaded only when the next item is asked for, so stopping the iteration
+        early leaves the remaining pages unvisited. Without prefetching, this page stays on the last
+        page read. With prefetching, the pages are read by this page and another tab in turn,
+        so this page ends up on the last page read or on a page next to it.
+
+        Args:
+            capture (ListingCapture, optional): A capture attached to this page before searching.
+                                                When given, the listings are taken from the search
+                                                data responses instead of the cards in the page
+                                                (except a first page with no such response).
+            prefetch (bool, optional): Load every next page in the background while reading the current
+                                       one (see iter_pages_prefetched). Defaults to False.
+
+        Yields:
+            list[CardRecord]: The cards of every page, in order.
+
+        Raises:
+            ValueError: If asked to prefetch the pages with a capture.
+        """
+
+        if prefetch:
+            if capture is not None:
+                raise ValueError("Prefetching the results pages doesn't work with a listing capture.")
+
+            yield from self.iter_pages_prefetched()
+            return
+
+        # Go back to the first page (if not already on it)
+        if self.first_page_button().is_enabled():
+            self.go_back_to_first_page()
 
+        # Loop through the pages until there are no more pages
         while True:
-            try:
-                card = self.cards_locator().nth(card_index)
-                card.wait_for(state="visible", timeout=CARD_LOAD_TIMEOUT)
+            # The site renders the first page on the server when the search is loaded through its URL,
+            # with no search data response to capture, so then its cards are read from the page
+            if capture is None or (self.page_number == 1 and 1 not in capture.pages):
+                cards = self.extract_cards()
+            else:
+                capture.wait_for_page(self.page_number)
+                cards = capture.pages[self.page_number]
 
-                price = self.get_card_price(card)
+                for card in cards:
+                    card.page_url = self.page.url
 
-                if price < lowest_price:
-                    lowest_price = price
+            logging.debug(f"Done page {self.page_number}, read {len(cards)} cards.")
 
-                card_index += 1
-            except Exception as e:
+            yield cards
+
+            # If there are more pages, go to the next page
+            if self.next_page_button().is_enabled():
+                self.click_next_page()
+            else:
                 break
 
-        return lowest_price, card_index
+    def iter_pages_prefetched(self) -> Iterator[list[CardRecord]]:
+        """
+        Reads the results pages one at a time, starting at the first page, while the next page loads.
 
-    def find_highest_rated(
-        self, click: bool = False
-    ) -> tuple[int | float, str, Page | None]:
+        Two tabs take turns: before the cards of one page are read, the next page starts loading
+        in the other tab without waiting for the server (see start_loading), so the network and
+        the reading overlap. The pages are still yielded in order.
+        This page reads the odd pages, and the tab of the even pages is closed at the end.
+
+        Yields:
+            list[CardRecord]: The cards of every page, in order.
         """
-        Finds the highest rated apartment on Airbnb.
+
+        # Go back to the first page (if not already on it)
+        if self.first_page_button().is_enabled():
+            self.go_back_to_first_page()
+
+        reader = self
+        loader = SearchResultsPage(self.page.context.new_page())
+
+        try:
+            while True:
+                reader.wait_until_loaded()
+                next_url = reader.next_page_url()
+
+                # Start loading the next page before reading this one
+                if next_url is not None:
+                    loader.start_loading(next_url, reader.page_number + 1)
+
+                cards = reader.extract_cards()
+
+                logging.debug(f"Done page {reader.page_number}, read {len(cards)} cards.")
+
+                yield cards
+
+                if next_url is None:
+                    break
+
+                reader, loader = loader, reader
+        finally:
+            (loader if reader is self else reader).page.close()
+
+            # When stopped early, this page may still be loading the next page: let it get there
+            self.wait_until_loaded()
+
+    def iter_cards(
+        self, predicate: Callable[[CardRecord], bool] | None = None, prefetch: bool = False
+    ) -> Iterator[CardRecord]:
+        """
+        Reads the cards of the results lazily, page after page (see iter_pages).
+
+        For example, the first listing under $100:
+            next(search_results_page.iter_cards(lambda card: card.price < 100), None)
 
         Args:
-            click (bool, optional): If True, the function will click on the highest rated apartment and open its details page.
+            predicate (Callable[[CardRecord], bool], optional): Only the cards it accepts are yielded.
+            prefetch (bool, optional): Load every next page in the background. Defaults to False.
+
+        Yields:
+            CardRecord: The cards, in the order of the results.
+        """
+
+        for cards in self.iter_pages(prefetch=prefetch):
+            for card in cards:
+                if predicate is None or predicate(card):
+                    yield card
+
+    def scan(
+        self, max_tabs: int = 1, capture: ListingCapture | None = None, prefetch: bool = False
+    ) -> ResultsScan:
+        """
+        Reads all the cards in all the results pages, in a single pass starting at the first page.
+
+        Args:
+            max_tabs (int, optional): The number of results pages to load at the same time.
+                                      Defaults to 1, which pages through the results in this page.
+            capture (ListingCapture, optional): A capture attached to this page before searching.
+                                                When given, the listings are taken from the search
+                                                data responses instead of the cards in the page.
+            prefetch (bool, optional): Load every next page in the background while reading the current
+                                       one. Defaults to False.
 
         Returns:
-            tuple: A tuple containing the highest rated apartment's details (rating, description) and the new page (when not clicking this is None).
+            ResultsScan: The cards of all the pages.
+        """
+
+        if max_tabs > 1:
+            return self.scan_in_tabs(max_tabs)
+
+        results_scan = ResultsScan()
+
+        for cards in self.iter_pages(capture, prefetch):
+            results_scan.add(cards)
+
+        return results_scan
+
+    def scan_in_tabs(self, max_tabs: int = SCAN_MAX_TABS) -> ResultsScan:
         """
+        Reads all the cards in all the results pages, loading up to max_tabs pages at the same time
+        in other tabs of the browser context.
 
-        highest_rating = 0
-        highest_rating_page = 0
+        The pages to load are taken from the pagination bar, so every loaded page may reveal more pages.
+        This page stays on the first results page.
+
+        Args:
+            max_tabs (int, optional): The number of results pages to load at the same time.
+
+        Returns:
+            ResultsScan: The cards of all the pages.
+        """
 
         # Go back to the first page (if not already on it)
         if self.first_page_button().is_enabled():
             self.go_back_to_first_page()
-        page_index = 1
 
-        # Loop through the pages until there are no more pages
-        while True and page_index:
-            # Get the best card in the page
-            highest_rating_in_page, num_of_cards = self.get_max_card_rating_in_page()
+        cards_by_page = {1: self.extract_cards()}
+        page_urls = {1: self.page.url, **self.pagination_links()}
 
-            # If the rating in the page is higher than the highest rating, update the highest rating
-            if highest_rating_in_page > highest_rating:
-                highest_rating = highest_rating_in_page
-                highest_rating_page = page_index
+        tabs = []
 
-            logging.debug(f"Done page {page_index}, read {num_of_cards} cards.")
+        try:
+            while True:
+                pages_to_load = sorted(
+                    number for number in page_urls if number not in cards_by_page
+                )[:max_tabs]
 
-            # If there are more pages, go to the next page
-            if self.next_page_button().is_enabled() and page_index:
+                if not pages_to_load:
+                    break
+
+                # Open more tabs if needed, and reuse the ones we already have
+                while len(tabs) < len(pages_to_load):
+                    tabs.append(SearchResultsPage(self.page.context.new_page()))
+
+                # Start loading all the pages before waiting for any of them
+                for tab, number in zip(tabs, pages_to_load):
+                    tab.start_loading(page_urls[number], number)
+
+                for tab, number in zip(tabs, pages_to_load):
+                    tab.wait_until_loaded()
+                    cards_by_page[number] = tab.extract_cards()
+
+                    for link_number, link_url in tab.pagination_links().items():
+                        page_urls.setdefault(link_number, link_url)
+
+                    logging.debug(f"Done page {number}, read {len(cards_by_page[number])} cards.")
+        finally:
+            for tab in tabs:
+                tab.page.close()
+
+        results_scan = ResultsScan()
+
+        for number in sorted(cards_by_page):
+            results_scan.add(cards_by_page[number])
+
+        return results_scan
+
+    def go_to_card(self, card: CardRecord):
+        """
+        Goes to the results page of a scanned card.
+
+        When the URL of the card's results page is known, it is loaded directly (one navigation),
+        otherwise the pagination buttons are used.
+
+        Args:
+            card (CardRecord): The card, as read by a scan.
+
+        Returns:
+            Locator: The card element.
+        """
+
+        if card.page != self.page_number and card.page_url:
+            self._stale_first_card_url = None
+            self.page.goto(card.page_url)
+            self.page_number = card.page
+        elif card.page < self.page_number:
+            self.go_back_n_pages(self.page_number - card.page)
+        else:
+            for _ in range(card.page - self.page_number):
                 self.click_next_page()
-                page_index += 1
-            else:
-                break
 
-        # Now go back to the page with the highest rating
-        self.go_back_n_pages(page_index - highest_rating_page)
+        return self.cards_locator().nth(card.index)
 
-        # Get the card with the highest rating
-        best_card = self.find_card_by_rating(highest_rating)
+    def open_card(self, card: CardRecord) -> Page:
+        """
+        Opens the details page of a scanned card in a new page.
 
-        if best_card is None:
-            logging.error("No card with the highest rating was found.")
-            raise ValueError("No card with the highest rating was found.")
+        When the card's listing link is known it is opened directly,
+        otherwise we go back to the card and click on it.
+
+        Args:
+            card (CardRecord): The card, as read by a scan.
+
+        Returns:
+            Page: The details page.
+        """
 
-        best_card_desc = best_card.inner_text()
+        if card.url:
+            new_page = self.page.context.new_page()
+            new_page.goto(card.url)
 
-        current_page = None
+            return new_page
 
-        if click:
-            # Click on the card and open the details page
-            with self.page.context.expect_page() as new_page_info:
-                best_card.click()
+        card_locator = self.go_to_card(card)
 
-            current_page = new_page_info.value
+        with self.page.context.expect_page() as new_page_info:
+            card_locator.click()
 
-        return highest_rating, best_card_desc, current_page
+        return new_page_info.value
+
+    def find_highest_rated(
+        self, click: bool = False, results_scan: ResultsScan | None = None
+    ) -> tuple[int | float, str, Page | None]:
+        """
+        Finds the highest rated apartment on Airbnb.
+
+        Without a scan, the results are read page by page until a card with the maximum rating shows up.
+
+        Args:
+            click (bool, optional): If True, the function will click on the highest rated apartment and open its details page.
+            results_scan (ResultsScan, optional): A scan of the results to use instead of scanning them again.
+
+        Returns:
+            tuple: A tuple containing the highest rated apartment's details (rating, description) and the new page (when not clicking this is None).
+        """
+
+        if results_scan is None:
+            results_scan = ResultsScan()
+
+            for card in self.iter_cards(prefetch=True):
+                results_scan.add([card])
+
+                if card.rating >= MAX_RATING:
+                    break
+
+        best_card = self.highest_rated_card(results_scan)
+        current_page = self.open_card(best_card) if click else None
+
+        return best_card.rating, best_card.text, current_page
 
     def find_cheapest(
-        self, click: bool = False
+        self, click: bool = False, results_scan: ResultsScan | None = None
     ) -> tuple[int | float, str, Page | None]:
         """
         Finds the cheapest apartment on Airbnb.
 
         Args:
             click (bool, optional): If True, the function will click on the cheapest apartment and open its details page.
+            results_scan (ResultsScan, optional): A scan of the results to use instead of scanning them again.
 
         Returns:
             tuple: A tuple containing the cheapest apartment's details (price, description) and the new page (when not clicking this is None).
         """
 
-        lowest_price = float("inf")
-        lowest_price_page = 0
+        if results_scan is None:
+            results_scan = self.scan(prefetch=True)
+
+        best_card = self.cheapest_card(results_scan)
+        current_page = self.open_card(best_card) if click else None
+
+        return best_card.price, best_card.text, current_page
+
+    def rank(
+        self, k: int = 5, min_reviews: int = MIN_REVIEWS, results_scan: ResultsScan | None = None
+    ) -> dict[str, list[CardRecord]]:
+        """
+        Shortlists the k best apartments by rating, price, rating with enough reviews, and rating per price.
+
+        Without a scan, the results are read page by page and only the shortlists are kept.
+        Any card of a shortlist can then be opened with open_card().
+
+        Args:
+            k (int, optional): The number of apartments in every shortlist. Defaults to 5.
+            min_reviews (int, optional): The number of reviews an apartment needs to be in the
+                                         "reviewed_rating" shortlist. Defaults to MIN_REVIEWS.
+            results_scan (ResultsScan, optional): A scan of the results to use instead of reading them again.
+
+        Returns:
+            dict[str, list[CardRecord]]: The cards of every shortlist ("rating", "price",
+                                         "reviewed_rating" and "value"), from the best down.
+        """
+
+        if results_scan is not None:
+            return results_scan.rank(k, min_reviews)
+
+        ranker = Ranker(k, min_reviews)
+
+        for cards in self.iter_pages(prefetch=True):
+            ranker.add(cards)
+
+        return ranker.results()
+
+    def extract_changed_cards(self, known_fingerprint: str | None) -> tuple[str, list[CardRecord] | None]:
+        """
+        Fingerprints the cards of the current results page once they settle, and extracts them
+        if the page changed, with a single evaluation in the browser.
+
+        Args:
+            known_fingerprint (str | None): The fingerprint of the page in an earlier scan, if any.
+
+        Returns:
+            tuple[str, list[CardRecord] | None]: The fingerprint (the number of cards and a hash of their
+                                                 links and texts, for example "18:9f3a0c1d"), and the
+                                                 parsed cards, or None if the fingerprint is the known one.
+        """
+
+        self.wait_for_cards()
+
+        page_state = self.cards_locator().evaluate_all(FINGERPRINT_AND_EXTRACT_SCRIPT, known_fingerprint)
+
+        if page_state["cards"] is None:
+            return page_state["fingerprint"], None
+
+        return page_state["fingerprint"], self.to_cards(page_state["cards"])
+
+    def scan_incremental(self, store: ListingStore, query: SearchQuery, scan_id: int) -> ResultsScan:
+        """
+        Reads all the cards in all the results pages, reusing the stored cards of the pages
+        whose fingerprint didn't change since the last scan, and records the scan in the store.
+
+        Args:
+            store (ListingStore): The store of the earlier scans.
+            query (SearchQuery): The search these are the results of.
+            scan_id (int): The id of this scan in the store (see ListingStore.start_scan).
+
+        Returns:
+            ResultsScan: The cards of all the pages.
+        """
+
+        known_pages = store.page_fingerprints(query)
+        results_scan = ResultsScan()
+        reused = 0
 
         # Go back to the first page (if not already on it)
         if self.first_page_button().is_enabled():
             self.go_back_to_first_page()
-        page_index = 1
 
-        # Loop through the pages until there are no more pages
         while True:
-            # Get the best card in the page
-            lowest_price_in_page, num_of_cards = self.get_min_card_price_in_page()
+            known_scan_id, known_fingerprint = known_pages.get(self.page_number, (None, None))
+            fingerprint, cards = self.extract_changed_cards(known_fingerprint)
+
+            if cards is None:
+                cards = store.page_cards(known_scan_id, self.page_number)
+                reused += 1
 
-            # If the lowest price in the page is lower than the lowest price, update the lowest price
-            if lowest_price_in_page < lowest_price:
-                lowest_price = lowest_price_in_page
-                lowest_price_page = page_index
+                for card in cards:
+                    card.page_url = self.page.url
 
-            logging.debug(f"Done page {page_index}, read {num_of_cards} cards.")
+                self._first_card_url = cards[0].url if cards else None
+
+            store.add_page(scan_id, self.page_number, self.page.url, fingerprint, cards)
+            results_scan.add(cards)
 
             # If there are more pages, go to the next page
             if self.next_page_button().is_enabled():
                 self.click_next_page()
-                page_index += 1
             else:
                 break
 
-        # Now go back to the page with the lowest price
-        self.go_back_n_pages(page_index - lowest_price_page)
+        logging.info(f"Reused the cards of {reused} of {results_scan.num_of_pages} results pages.")
 
-        # Get the card with the lowest price
-        best_card = self.find_card_by_price(lowest_price)
+        return results_scan
 
-        if best_card is None:
-            logging.error("No card with the lowest price was found.")
-            raise ValueError("No card with the lowest price was found.")
+    def refresh_details(
+        self,
+        store: ListingStore,
+        query: SearchQuery,
+        scan_id: int,
+        cards: Iterable[CardRecord],
+        max_tabs: int = DETAILS_MAX_TABS,
+    ) -> int:
+        """
+        Reads the details pages of the cards that are new or changed since their last snapshot
+        (see ListingStore.needs_details), in parallel, and records their snapshots in the store.
+        Snapshots without a total price (of pages that timed out) are not recorded.
+
+        Args:
+            store (ListingStore): The store of the earlier scans.
+            query (SearchQuery): The search the cards were found by.
+            scan_id (int): The id of the scan the cards are from.
+            cards (Iterable[CardRecord]): The cards, for example a shortlist from rank().
+            max_tabs (int, optional): The number of details pages to load at the same time.
+
+        Returns:
+            int: The number of snapshots recorded.
+        """
+
+        stale_cards = [card for card in cards if card.listing_id and store.needs_details(query, card)]
+        recorded = 0
+
+        for card, snapshot in self.iter_details(stale_cards, max_tabs):
+            # A page that timed out before showing its total is read again next time
+            if snapshot is not None and snapshot.total_price is not None:
+                store.add_snapshot(scan_id, card.listing_id, snapshot)
+                recorded += 1
+
+        return recorded
+
+    def iter_details(
+        self, cards: Iterable[CardRecord], max_tabs: int = DETAILS_MAX_TABS
+    ) -> Iterator[tuple[CardRecord, BookingSnapshot | None]]:
+        """
+        Opens the details pages of many cards, up to max_tabs at the same time, and reads their booking panels.
+
+        The pages are loaded in tabs of this browser context, all at the same time, and checked in turn until they show
+        their total price (or DETAILS_LOAD_TIMEOUT passes), so the results come in as soon as they are ready.
+        Cards without a listing link are skipped.
+
+        Args:
+            cards (Iterable[CardRecord]): The cards, for example a shortlist from rank().
+            max_tabs (int, optional): The number of details pages to load at the same time.
+
+        Yields:
+            tuple[CardRecord, BookingSnapshot | None]: Every card with the snapshot of its booking panel,
+                                                       in the order they are ready (None if it couldn't be read).
+        """
+
+        pending = deque()
+
+        for card in cards:
+            if card.url:
+                pending.append(card)
+            else:
+                logging.warning(f"Skipping card {card.index} of page {card.page}, it has no listing link.")
+
+        # The tabs loading a details page, with their card, the URL they were on before,
+        # the time they started and their last snapshot
+        loading = {}
+        tabs = []
 
-        best_card_desc = best_card.inner_text()
+        try:
+            while pending or loading:
+                # Start loading the next cards in the free tabs, without waiting for the server,
+                # so the requests of all the tabs are in flight at the same time
+                while pending and len(loading) < max_tabs:
+                    tab = next((tab for tab in tabs if tab not in loading), None)
 
-        current_page = None
+                    if tab is None:
+                        tab = AptDetails(self.page.context.new_page())
+                        tabs.append(tab)
+
+                    card = pending.popleft()
+                    loading_from = tab.page.url
+                    tab.page.evaluate(START_LOADING_SCRIPT, card.url)
+                    loading[tab] = (card, loading_from, time.monotonic(), None)
+
+                ready = []
+
+                for tab, (card, loading_from, started, snapshot) in loading.items():
+                    # A tab still on its previous page shows the booking panel of the previous card
+                    if tab.page.url != loading_from:
+                        snapshot = tab.read_snapshot()
+
+                    timed_out = time.monotonic() - started > DETAILS_LOAD_TIMEOUT / 1000
+
+                    if (snapshot is not None and snapshot.total_price is not None) or timed_out:
+                        ready.append(tab)
+
+                    loading[tab] = (card, loading_from, started, snapshot)
+
+                for tab in ready:
+                    card, _, _, snapshot = loading.pop(tab)
+
+                    if snapshot is None or snapshot.total_price is None:
+                        logging.warning(f"Timed out reading the details page of {card.url}")
+
+                    yield card, snapshot
+
+                if not ready:
+                    self.page.wait_for_timeout(DETAILS_POLL_INTERVAL)
+        finally:
+            for tab in tabs:
+                tab.page.close()
+
+    def rank_by_total(
+        self, cards: Iterable[CardRecord], max_tabs: int = DETAILS_MAX_TABS
+    ) -> list[tuple[CardRecord, BookingSnapshot]]:
+        """
+        Sorts cards by the total price shown in their details pages, read in parallel (see iter_details).
+
+        Args:
+            cards (Iterable[CardRecord]): The cards, for example a shortlist from rank().
+            max_tabs (int, optional): The number of details pages to load at the same time.
+
+        Returns:
+            list[tuple[CardRecord, BookingSnapshot]]: The cards with a total price and their snapshots,
+                                                      from the cheapest up (ties keep the order of the cards).
+        """
 
-        if click:
-            # Click on the card and open the details page
-            with self.page.context.expect_page() as new_page_info:
-                best_card.click()
+        cards = list(cards)
+        position = {id(card): i for i, card in enumerate(cards)}
 
-            current_page = new_page_info.value
+        details = [
+            (card, snapshot)
+            for card, snapshot in self.iter_details(cards, max_tabs)
+            if snapshot is not None and snapshot.total_price is not None
+        ]
 
-        return lowest_price, best_card_desc, current_page
+        return sorted(details, key=lambda detail: (detail[1].total_price, position[id(detail[0])]))
 
     # Verification
 
@@ -1,39 +1,33 @@
-from pages.home_page import HomePage
-from pages.search_results import SearchResultsPage
 from pages.apt_details import AptDetails
 from pages.reservation_page import ReservationPage
 from datetime import datetime
 import logging
+from utils.search_query import SearchQuery
 from utils.util import format_date_to_airbnb
 
 
-def test_search(page, base_url):
+def test_search(page, search_session):
     """
     Searches for apartments in a certain place, with a certain number of adult guests,
     and verifies the search results.
     """
 
-    home_page = HomePage(page, base_url)
-
     # Define search parameters
     location = "Tel Aviv"
     check_in_date = datetime(2025, 5, 1)
     check_out_date = datetime(2025, 5, 3)
     num_of_adults = 2
+    search_query = SearchQuery(location, check_in_date, check_out_date, num_of_adults)
 
-    # Go to the home page
-    logging.info("1. Navigating to Airbnb website...")
-    home_page.goto()
-
-    # Search for apartments and get the search results page
+    # Search for apartments through the search form of the home page, whatever --search-mode says,
+    # so the form is always covered (no other test makes this search), and get the search results page
     logging.info(
-        f"2. Searching apartments for {num_of_adults} adults in {location} with check-in: {check_in_date} and check-out: {check_out_date}"
+        f"1-2. Searching apartments for {num_of_adults} adults in {location} with check-in: {check_in_date} and check-out: {check_out_date}"
     )
-    home_page.search_apartments(location, check_in_date, check_out_date, num_of_adults)
+    search_results_page = search_session.search(page, search_query, mode="ui")
 
     # Verify the search results page
     logging.info("3. Verifying search results...")
-    search_results_page = SearchResultsPage(home_page.page)
     search_results_page.verify_results(
         location, check_in_date, check_out_date, num_of_adults
     )
@@ -41,54 +35,62 @@ def test_search(page, base_url):
     # Find the highest rated apartment
     logging.info("4. Analyzing search results...")
 
-    rating, text, _ = search_results_page.find_highest_rated(click=False)
+    results_scan = search_session.scan(search_results_page, search_query)
+
+    rating, text, _ = search_results_page.find_highest_rated(
+        click=False, results_scan=results_scan
+    )
     logging.info("a. Highest Rated Apartment:")
     logging.info(f"Highest Rating:   {rating}")
     logging.info(f"Apt. Details:     {text}")
 
-    price, text, _ = search_results_page.find_cheapest(click=False)
+    price, text, _ = search_results_page.find_cheapest(
+        click=False, results_scan=results_scan
+    )
     logging.info("b. Cheapest Apartment:")
     logging.info(f"Cheapest Price:   {price}")
     logging.info(f"Apt. Details:     {text}")
 
+    # Record the booking details of the top rated apartments (only with --listing-store)
+    recorded = search_session.refresh_details(
+        search_results_page, search_query, results_scan.top_rated(5)
+    )
+    logging.info(f"c. Recorded the booking details of {recorded} apartments.")
+
 
-def test_reservation(page, base_url):
+def test_reservation(page, search_session):
     """
     Searches for apartments in a certain place, with a certain number of guests,
     then try to make a reservation.
     """
 
-    home_page = HomePage(page, base_url)
-
     # Define search parameters
     location = "Tel Aviv"
     check_in_date = datetime(2025, 5, 1)
     check_out_date = datetime(2025, 5, 5)
     num_of_adults = 2
     num_of_children = 1
+    search_query = SearchQuery(
+        location, check_in_date, check_out_date, num_of_adults, num_of_children
+    )
 
-    # Go to the home page
-    logging.info("1. Navigating to Airbnb website...")
-    home_page.goto()
-
-    # Search for apartments
+    # Search for apartments (from the home page, unless an earlier test made this search)
     logging.info(
-        f"2. Searching apartments for {num_of_adults} adults and {num_of_children} children in {location} with check-in: {check_in_date} and check-out: {check_out_date}"
-    )
-    home_page.search_apartments(
-        location, check_in_date, check_out_date, num_of_adults, num_of_children
+        f"1-2. Searching apartments for {num_of_adults} adults and {num_of_children} children in {location} with check-in: {check_in_date} and check-out: {check_out_date}"
     )
+    search_results_page = search_session.search(page, search_query)
 
     # Verify the search results page
     logging.info("3. Verifying search results...")
-    search_results_page = SearchResultsPage(home_page.page)
     search_results_page.verify_results(
         location, check_in_date, check_out_date, num_of_adults + num_of_children
     )
 
     # Find the highest rated apartment and click on it
     logging.info("4. Selecting highest rated apartment...")
-    _, _, new_page = search_results_page.find_highest_rated(click=True)
+    _, _, new_page = search_results_page.find_highest_rated(
+        click=True, results_scan=search_session.scan(search_results_page, search_query)
+    )
 
     details_page = AptDetails(new_page)
 
@@ -98,17 +100,12 @@ def test_reservation(page, base_url):
     # Save reservation details
     logging.info("5a. Saving reservation details...")
 
-    # Dates
-    dates = details_page.get_dates()
-    checkin_dt, checkout_dt = dates
-    checkin_str = format_date_to_airbnb(checkin_dt)
-    checkout_str = format_date_to_airbnb(checkout_dt)
-
-    # Guests
-    guests = details_page.get_number_of_guests()
-
-    # Price
-    price = details_page.get_total_price()
+    # Dates, guests and price, read from the booking panel at once
+    booking = details_page.snapshot()
+    checkin_str = format_date_to_airbnb(booking.check_in_date)
+    checkout_str = format_date_to_airbnb(booking.check_out_date)
+    guests = booking.guests
+    price = booking.total_price
 
     # Print the reservation details
     logging.info("5b. Printing reservation details...")
@@ -0,0 +1,48 @@
+from utils.card_columns import NO_LISTING_ID, CardColumns
+from utils.records import CardRecord
+
+RAW_CARDS = [
+    {
+        "index": 0,
+        "text": "Apartment in Tel Aviv\n4.85 out of 5 average rating, 120 reviews\n₪1,200\nShow price breakdown",
+        "url": "https://www.airbnb.com/rooms/123?adults=2",
+    },
+    {
+        "index": 1,
+        "text": "Loft in Tel Aviv\nNew\n₪450\nShow price breakdown",
+        "url": None,
+    },
+    {
+        "index": 2,
+        "text": "Condo in Tel Aviv\n4.97 out of 5 average rating, 8 reviews\n₪900\nShow price breakdown",
+        "url": "https://www.airbnb.com/rooms/456",
+    },
+]
+
+
+def test_card_columns():
+    """
+    Parses a page of cards into columns, and queries them the same way as the records.
+    """
+
+    card_columns = CardColumns()
+    card_columns.add_raw(RAW_CARDS, page=2)
+
+    assert list(card_columns.listing_ids) == [123, NO_LISTING_ID, 456]
+    assert list(card_columns.pages) == [2, 2, 2]
+    assert list(card_columns.ratings) == [4.85, -1, 4.97]
+    assert list(card_columns.prices) == [1200, 450, 900]
+    assert list(card_columns.reviews) == [120, 0, 8]
+    assert card_columns.nbytes == 32 * 3
+
+    assert list(card_columns.where(min_rating=4.8)) == [0, 2]
+    assert list(card_columns.where(min_rating=4.8, min_reviews=10)) == [0]
+    assert list(card_columns.where(max_price=1000)) == [1, 2]
+    assert card_columns.order_by("ratings", descending=True) == [2, 0, 1]
+    assert card_columns.mean("prices", card_columns.where(min_rating=0)) == 1050
+
+    cheapest = card_columns.take(card_columns.order_by("prices")[:1])
+    assert cheapest.row(0)["listing_ids"] == NO_LISTING_ID
+
+    records = [CardRecord.from_raw(raw_card, page=2) for raw_card in RAW_CARDS]
+    assert CardColumns.from_cards(records).columns() == card_columns.columns()
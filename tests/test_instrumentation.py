@@ -0,0 +1,45 @@
+import time
+from pages.apt_details import AptDetailsBase
+from pages.search_results import WAIT_FOR_CARDS_SCRIPT, SearchResultsPageBase
+from utils.instrumentation import StepTracer
+
+
+def test_step_tracer_splits_waits_and_times_generators():
+    tracer = StepTracer()
+    tracer.install()
+
+    try:
+        # The methods of the shared base classes are traced too
+        assert hasattr(vars(SearchResultsPageBase)["to_cards"], "__wrapped__")
+        assert hasattr(vars(AptDetailsBase)["booking_panel"], "__wrapped__")
+
+        def evaluate(page, expression, arg=None):
+            time.sleep(0.05)
+
+        def fill(locator, value):
+            time.sleep(0.02)
+
+        evaluate = tracer.wrap(evaluate, "Page.evaluate", "playwright")
+        fill = tracer.wrap(fill, "Locator.fill", "playwright")
+
+        def iter_pages():
+            for _ in range(2):
+                evaluate(None, WAIT_FOR_CARDS_SCRIPT)
+                fill(None, "054-1234567")
+                yield
+
+        iter_pages = tracer.wrap(iter_pages, "SearchResultsPage.iter_pages", "page")
+
+        for _ in iter_pages():
+            # The caller's time between the pages
+            time.sleep(0.1)
+    finally:
+        tracer.uninstall()
+
+    step = next(step for step in tracer.timeline() if step["name"] == "SearchResultsPage.iter_pages")
+
+    assert step["calls"] == 4
+    assert 0.1 <= step["wait"] < 0.15
+    assert 0.14 <= step["duration"] < 0.2
+    assert step["work"] < 0.1
+    assert not hasattr(vars(SearchResultsPageBase)["to_cards"], "__wrapped__")
@@ -0,0 +1,62 @@
+import json
+from pathlib import Path
+from utils.listing_capture import ListingCapture, page_number_of, parse_search_response
+
+FIXTURE = Path(__file__).parent / "fixtures" / "stays_search_response.json"
+PAGE_URL = "https://www.airbnb.com/s/Tel-Aviv/homes?adults=2"
+
+
+def load_fixture():
+    return json.loads(FIXTURE.read_text())
+
+
+def test_parse_search_response():
+    """
+    Builds the listing records from a recorded search data response.
+    """
+
+    listings = parse_search_response(load_fixture(), page=2, page_url=PAGE_URL)
+
+    assert [listing.listing_id for listing in listings] == ["40012345", "51234", "777", "88"]
+    assert [listing.index for listing in listings] == [0, 1, 2, 3]
+    assert all(listing.page == 2 for listing in listings)
+
+    first, new, legacy, last = listings
+
+    assert (first.rating, first.reviews, first.price) == (4.93, 150, 1210)
+    assert first.url == "https://www.airbnb.com/rooms/40012345"
+
+    # A new listing has no rating, and the discounted price is the one shown
+    assert (new.rating, new.reviews, new.price) == (-1, 0, 640)
+
+    # The older response layout
+    assert (legacy.rating, legacy.reviews, legacy.price) == (5.0, 3, 455)
+
+    assert (last.rating, last.reviews) == (4.71, 1024)
+
+
+def test_page_number_of():
+    data = load_fixture()
+    cursors = data["data"]["presentation"]["staysSearch"]["results"]["paginationInfo"]["pageCursors"]
+
+    assert page_number_of(data, None) == 1
+    assert page_number_of(data, cursors[2]) == 3
+    assert page_number_of(data, "unknown") is None
+
+
+def test_capture_aggregates_without_page():
+    """
+    Aggregates the captured pages the same way as a scan of the cards.
+    """
+
+    capture = ListingCapture()
+    capture.add(load_fixture(), page_url=PAGE_URL)
+    capture.add(load_fixture(), page_url=PAGE_URL)
+
+    results_scan = capture.to_scan()
+
+    assert len(results_scan) == 8
+    assert results_scan.num_of_pages == 2
+    assert results_scan.highest_rated().listing_id == "777"
+    assert results_scan.highest_rated().page == 1
+    assert results_scan.lowest_priced().price == 455
@@ -0,0 +1,54 @@
+from datetime import datetime
+from utils.listing_store import ListingStore
+from utils.records import BookingSnapshot, CardRecord
+from utils.search_query import SearchQuery
+
+QUERY = SearchQuery("Tel Aviv", datetime(2025, 5, 1), datetime(2025, 5, 3), 2)
+PAGE_URL = "https://www.airbnb.com/s/Tel-Aviv/homes?adults=2"
+
+
+def card(index, listing_id, price, page=1):
+    return CardRecord(
+        index, f"Listing {listing_id}", f"https://www.airbnb.com/rooms/{listing_id}", 4.9, price,
+        page=page, page_url=PAGE_URL, listing_id=listing_id, reviews=20,
+    )
+
+
+def snapshot(total_price):
+    return BookingSnapshot(QUERY.check_in_date, QUERY.check_out_date, 2, None, total_price, True)
+
+
+def test_listing_store_tracks_scans():
+    """
+    Records two scans of a search, and reads back the fingerprints, cards and history of the listings.
+    """
+
+    with ListingStore() as store:
+        first_scan = store.start_scan(QUERY, datetime(2025, 4, 1))
+        store.add_page(first_scan, 1, PAGE_URL, "2:aaaa", [card(0, "1", 300), card(1, "2", 400)])
+        store.add_page(first_scan, 2, PAGE_URL, "1:bbbb", [card(0, "3", 500, page=2)])
+        store.add_snapshot(first_scan, "1", snapshot(650))
+
+        # A scan of another search doesn't count
+        other_scan = store.start_scan(QUERY.with_guests(3))
+        store.add_page(other_scan, 1, PAGE_URL, "2:cccc", [card(0, "1", 350)])
+
+        assert store.page_fingerprints(QUERY) == {1: (first_scan, "2:aaaa"), 2: (first_scan, "1:bbbb")}
+        assert store.page_cards(first_scan, 2) == [card(0, "3", 500, page=2)]
+
+        # The second page changed, the first one didn't
+        second_scan = store.start_scan(QUERY, datetime(2025, 4, 2))
+        store.add_page(second_scan, 1, PAGE_URL, "2:aaaa", store.page_cards(first_scan, 1))
+        store.add_page(second_scan, 2, PAGE_URL, "1:dddd", [card(0, "3", 450, page=2)])
+
+        assert store.page_fingerprints(QUERY)[2] == (second_scan, "1:dddd")
+
+        # Only the listings without a snapshot, or whose card changed since theirs, need their details
+        assert not store.needs_details(QUERY, card(0, "1", 300))
+        assert store.needs_details(QUERY, card(0, "1", 280))
+        assert store.needs_details(QUERY, card(0, "3", 450, page=2))
+
+        assert store.history(QUERY, "1") == [
+            {"scanned_at": "2025-04-01T00:00:00", "rating": 4.9, "price": 300, "total_price": 650},
+            {"scanned_at": "2025-04-02T00:00:00", "rating": 4.9, "price": 300, "total_price": None},
+        ]
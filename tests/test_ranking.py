@@ -0,0 +1,42 @@
+from utils.ranking import Ranker
+from utils.records import CardRecord
+from utils.results_scan import ResultsScan
+
+
+def card(index, rating, price, reviews=100):
+    return CardRecord(index, f"Card {index}", None, rating, price, reviews=reviews)
+
+
+CARDS = [
+    card(0, 4.8, 300),
+    card(1, 5.0, 900, reviews=2),
+    card(2, -1, 100, reviews=0),
+    card(3, 4.9, 200),
+    card(4, 4.9, float("inf")),
+    card(5, 4.5, 100),
+]
+
+
+def test_ranker_shortlists():
+    """
+    Builds every shortlist in one pass, breaking ties by the position of the cards.
+    """
+
+    ranker = Ranker(k=3, min_reviews=10)
+    ranker.add(CARDS)
+    shortlists = ranker.results()
+
+    def indexes(name):
+        return [shortlisted.index for shortlisted in shortlists[name]]
+
+    assert indexes("rating") == [1, 3, 4]
+    assert indexes("price") == [2, 5, 3]
+    assert indexes("reviewed_rating") == [3, 4, 0]
+    assert indexes("value") == [5, 3, 0]
+
+    # The same shortlists as the queries of a scan
+    results_scan = ResultsScan(CARDS)
+
+    assert shortlists == results_scan.rank(k=3, min_reviews=10)
+    assert results_scan.highest_rated() is CARDS[1]
+    assert results_scan.lowest_priced() is CARDS[2]
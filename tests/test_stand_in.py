@@ -0,0 +1,433 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+import json
+import time
+import urllib.request
+from playwright.async_api import async_playwright
+from playwright.sync_api import expect
+import pytest
+from pages.aio.home_page import AsyncHomePage
+from pages.aio.search_results import AsyncSearchResultsPage
+from pages.apt_details import AptDetails
+from pages.home_page import HomePage
+from pages.reservation_page import ReservationPage
+from pages.search_results import SearchResultsPage
+from utils.listing_capture import ListingCapture, parse_search_response
+from utils.listing_store import ListingStore
+from utils.search_query import SearchQuery
+from utils.search_session import SearchSession
+from utils.stand_in_server import listing_at
+
+# The tests search in May 2025, so the home page calendar must show it whatever the date
+pytestmark = pytest.mark.stand_in(calendar_start=date(2025, 1, 1))
+
+
+def test_stand_in_renders_pages(stand_in):
+    """
+    Checks the stand-in renders what the page objects depend on, without a browser.
+    """
+
+    def get(url, data=None):
+        return urllib.request.urlopen(urllib.request.Request(url, data=data)).read().decode()
+
+    home = get(stand_in.url)
+    assert 'data-testid="structured-search-input-field-query"' in home
+    assert "aria-label='1, Thursday, May 2025'" in home
+
+    search_query = SearchQuery("Tel Aviv", datetime(2025, 5, 1), datetime(2025, 5, 3), 2)
+    results = get(search_query.url(stand_in.url))
+    assert results.count('data-testid="card-container"') == stand_in.config.cards_per_page
+    assert "May 1 – 3, 2025" in results
+    assert ">Next</a>" in results
+    assert "3 guests" in get(search_query.with_guests(2, 1).url(stand_in.url))
+
+    search_data = json.loads(get(f"{stand_in.url}api/v3/StaysSearch", data=b"{}"))
+    listings = parse_search_response(search_data, page_url=stand_in.url)
+    assert [listing.listing_id for listing in listings] == [
+        str(listing_at(stand_in.config, position).id)
+        for position in range(stand_in.config.cards_per_page)
+    ]
+
+
+@pytest.mark.stand_in(num_of_pages=3, cards_per_page=6)
+def test_search_on_stand_in(page, stand_in):
+    """
+    Searches on the stand-in and checks the scan finds the best listings.
+    """
+
+    location = "Tel Aviv"
+    check_in_date = datetime(2025, 5, 1)
+    check_out_date = datetime(2025, 5, 3)
+    num_of_adults = 2
+
+    home_page = HomePage(page, stand_in.url)
+    home_page.goto()
+    home_page.search_apartments(location, check_in_date, check_out_date, num_of_adults)
+
+    search_results_page = SearchResultsPage(page)
+    search_results_page.verify_results(location, check_in_date, check_out_date, num_of_adults)
+
+    results_scan = search_results_page.scan()
+    listings = [listing_at(stand_in.config, position) for position in range(18)]
+
+    assert len(results_scan) == 18
+    assert results_scan.highest_rated().rating == max(
+        listing.rating for listing in listings if listing.rating is not None
+    )
+    assert results_scan.lowest_priced().price == min(listing.nightly_price for listing in listings)
+
+
+@pytest.mark.stand_in(
+    num_of_pages=2,
+    translation_popup=True,
+    reservation_layout="left",
+    phone_layout="inline",
+)
+def test_reservation_on_stand_in(page, stand_in):
+    """
+    Makes a reservation on the stand-in, with the less common page layouts.
+    """
+
+    check_in_date = datetime(2025, 5, 1)
+    check_out_date = datetime(2025, 5, 5)
+
+    home_page = HomePage(page, stand_in.url)
+    home_page.goto()
+    home_page.search_apartments("Tel Aviv", check_in_date, check_out_date, 2, 1)
+
+    _, _, new_page = SearchResultsPage(page).find_highest_rated(click=True)
+
+    details_page = AptDetails(new_page)
+    details_page.click_close_translation_popup_button()
+
+    assert details_page.get_dates() == (check_in_date, check_out_date)
+    assert details_page.get_number_of_guests() == 3
+
+    booking = details_page.snapshot()
+    assert (booking.check_in_date, booking.check_out_date) == (check_in_date, check_out_date)
+    assert booking.guests == 3
+    assert booking.total_price == details_page.get_total_price()
+    assert booking.total_price == (booking.nightly_price + 25) * 4
+    assert booking.reserve_enabled
+
+    details_page.click_reserve_button()
+
+    reservation_page = ReservationPage(new_page)
+    reservation_page.verify_reservation(2, 1, check_in_date, check_out_date)
+    reservation_page.signup_with_phone("054-1234567")
+
+
+@pytest.mark.parametrize(
+    "reservation_layout, phone_layout",
+    [
+        pytest.param(
+            reservation_layout,
+            phone_layout,
+            marks=pytest.mark.stand_in(reservation_layout=reservation_layout, phone_layout=phone_layout),
+        )
+        for reservation_layout in ("summary", "left")
+        for phone_layout in ("continue", "inline")
+    ],
+)
+def test_reservation_layouts_on_stand_in(page, stand_in, reservation_layout, phone_layout):
+    """
+    Verifies the reservation and signs up with a phone number, in every layout of the reservation page.
+    """
+
+    check_in_date = datetime(2025, 5, 1)
+    check_out_date = datetime(2025, 5, 5)
+    reservation_url = f"{stand_in.url}book/stays/{listing_at(stand_in.config, 0).id}"
+    page.goto(f"{reservation_url}?checkin=2025-05-01&checkout=2025-05-05&numberOfAdults=2&numberOfChildren=1")
+
+    reservation_page = ReservationPage(page)
+    reservation_page.verify_reservation(2, 1, check_in_date, check_out_date)
+    reservation_page.signup_with_phone("054-1234567")
+
+    expect(reservation_page.phone_number_input()).to_have_value("054-1234567")
+
+
+@pytest.mark.stand_in(num_of_pages=1, cards_per_page=6, total_delay=1.0)
+def test_snapshot_waits_for_total_on_stand_in(page, stand_in):
+    """
+    Checks the snapshot of the booking panel waits for the total price, which shows up last.
+    """
+
+    search_query = SearchQuery("Tel Aviv", datetime(2025, 5, 1), datetime(2025, 5, 4), 2)
+    HomePage(page, stand_in.url).search(search_query)
+
+    card = SearchResultsPage(page).extract_cards()[0]
+    page.goto(card.url)
+
+    booking = AptDetails(page).snapshot()
+
+    assert booking.total_price == (card.price + 25) * 3
+    assert booking.guests == 2
+
+
+@pytest.mark.stand_in(num_of_pages=2)
+def test_search_session_on_stand_in(context, stand_in):
+    """
+    Checks a repeated search lands directly on the results, with the scan of the first one.
+    """
+
+    search_session = SearchSession(stand_in.url)
+    search_query = SearchQuery("Tel Aviv", datetime(2025, 5, 1), datetime(2025, 5, 3), 2)
+
+    first_page = context.new_page()
+    results_scan = search_session.scan(search_session.search(first_page, search_query), search_query)
+
+    second_page = context.new_page()
+    search_results_page = search_session.search(second_page, search_query)
+
+    assert second_page.url == search_session.searches[search_query].results_url
+    assert search_results_page.extract_cards()[0].url == results_scan.cards[0].url
+    assert search_session.scan(search_results_page, search_query) is results_scan
+
+
+@pytest.mark.stand_in(num_of_pages=3, cards_per_page=6)
+def test_iter_cards_stops_early_on_stand_in(page, stand_in):
+    """
+    Checks the lazy card iterator loads no page after the one with the card it was asked for.
+    """
+
+    search_query = SearchQuery("Tel Aviv", datetime(2025, 5, 1), datetime(2025, 5, 3), 2)
+    HomePage(page, stand_in.url).search(search_query)
+
+    listings = [listing_at(stand_in.config, position) for position in range(18)]
+    position = next(i for i, listing in enumerate(listings) if listing.nightly_price < 300)
+
+    search_results_page = SearchResultsPage(page)
+    card = next(search_results_page.iter_cards(lambda card: card.price < 300))
+
+    assert card.listing_id == str(listings[position].id)
+    assert search_results_page.page_number == position // 6 + 1
+
+
+@pytest.mark.stand_in(num_of_pages=4, cards_per_page=6, delay=0.2)
+def test_scan_prefetched_on_stand_in(page, stand_in):
+    """
+    Scans the results while prefetching the next pages, and checks they come in order.
+    """
+
+    search_query = SearchQuery("Tel Aviv", datetime(2025, 5, 1), datetime(2025, 5, 3), 2)
+    HomePage(page, stand_in.url).search(search_query)
+
+    results_scan = SearchResultsPage(page).scan(prefetch=True)
+
+    assert [card.listing_id for card in results_scan] == [
+        str(listing_at(stand_in.config, position).id) for position in range(24)
+    ]
+    assert [card.page for card in results_scan] == [position // 6 + 1 for position in range(24)]
+    assert len(page.context.pages) == 1
+
+
+@pytest.mark.stand_in(num_of_pages=3, cards_per_page=6)
+def test_scan_with_capture_on_stand_in(page, stand_in):
+    """
+    Scans the results from the search data responses, and checks they match the cards.
+    """
+
+    capture = ListingCapture()
+    capture.attach(page)
+
+    search_query = SearchQuery("Tel Aviv", datetime(2025, 5, 1), datetime(2025, 5, 3), 2)
+    HomePage(page, stand_in.url).search(search_query)
+
+    search_results_page = SearchResultsPage(page)
+    captured_scan = search_results_page.scan(capture=capture)
+    capture.detach()
+
+    listings = [listing_at(stand_in.config, position) for position in range(18)]
+
+    assert sorted(capture.pages) == [1, 2, 3]
+    assert [card.listing_id for card in captured_scan] == [str(listing.id) for listing in listings]
+    assert [card.price for card in captured_scan] == [listing.nightly_price for listing in listings]
+    assert [card.rating for card in captured_scan] == [
+        listing.rating if listing.rating is not None else -1 for listing in listings
+    ]
+
+
+@pytest.mark.stand_in(num_of_pages=3, cards_per_page=6)
+def test_scan_with_capture_of_later_pages_on_stand_in(page, stand_in):
+    """
+    Scans the results with a capture that missed the first page, like a first page rendered by the server,
+    and checks its cards are read from the page.
+    """
+
+    search_query = SearchQuery("Tel Aviv", datetime(2025, 5, 1), datetime(2025, 5, 3), 2)
+    HomePage(page, stand_in.url).search(search_query)
+    page.wait_for_load_state("networkidle")
+
+    capture = ListingCapture()
+    capture.attach(page)
+
+    captured_scan = SearchResultsPage(page).scan(capture=capture)
+    capture.detach()
+
+    assert sorted(capture.pages) == [2, 3]
+    assert [card.listing_id for card in captured_scan] == [
+        str(listing_at(stand_in.config, position).id) for position in range(18)
+    ]
+
+
+@pytest.mark.stand_in(num_of_pages=6, cards_per_page=6, delay=1.0)
+def test_scan_in_tabs_on_stand_in(page, stand_in):
+    """
+    Scans the results in several tabs at once, and checks the tabs wait for the server together.
+    """
+
+    search_query = SearchQuery("Tel Aviv", datetime(2025, 5, 1), datetime(2025, 5, 3), 2)
+    HomePage(page, stand_in.url).search(search_query)
+
+    search_results_page = SearchResultsPage(page)
+    search_results_page.wait_for_cards()
+
+    started = time.monotonic()
+    results_scan = search_results_page.scan_in_tabs(max_tabs=3)
+    elapsed = time.monotonic() - started
+
+    assert [card.listing_id for card in results_scan] == [
+        str(listing_at(stand_in.config, position).id) for position in range(36)
+    ]
+    assert [card.page for card in results_scan] == [position // 6 + 1 for position in range(36)]
+    assert len(page.context.pages) == 1
+
+    # Pages 2-6 come in two waves of tabs (the first page links to 2, 3 and 6), while loading
+    # them one after the other would wait for the server 5 times
+    assert elapsed < 5 * stand_in.config.delay
+
+
+@pytest.mark.stand_in(num_of_pages=2, cards_per_page=6, delay=0.5)
+def test_rank_by_total_on_stand_in(page, stand_in):
+    """
+    Reads the details pages of a shortlist in parallel, and sorts it by the total prices.
+    """
+
+    search_query = SearchQuery("Tel Aviv", datetime(2025, 5, 1), datetime(2025, 5, 3), 2)
+    HomePage(page, stand_in.url).search(search_query)
+
+    search_results_page = SearchResultsPage(page)
+    shortlist = search_results_page.rank(k=6)["price"]
+
+    started = time.monotonic()
+    ranked = search_results_page.rank_by_total(shortlist, max_tabs=3)
+    elapsed = time.monotonic() - started
+
+    # The stand-in adds a fee of 25 per night, so the order stays the one of the nightly prices
+    assert [card for card, _ in ranked] == shortlist
+    assert [snapshot.total_price for _, snapshot in ranked] == [(card.price + 25) * 2 for card in shortlist]
+    assert len(page.context.pages) == 1
+
+    # The 6 details pages come in two waves of tabs, while loading them one after the other
+    # would wait for the server 6 times
+    assert elapsed < 4 * stand_in.config.delay
+
+
+@pytest.mark.stand_in(num_of_pages=2, cards_per_page=6)
+def test_scan_incremental_on_stand_in(page, stand_in):
+    """
+    Scans the same search twice into a listing store, the second time from the stored cards.
+    """
+
+    search_query = SearchQuery("Tel Aviv", datetime(2025, 5, 1), datetime(2025, 5, 3), 2)
+
+    with ListingStore() as store:
+        scans = []
+
+        for _ in range(2):
+            HomePage(page, stand_in.url).search(search_query)
+            scan_id = store.start_scan(search_query)
+            scans.append(SearchResultsPage(page).scan_incremental(store, search_query, scan_id))
+
+        first_scan, second_scan = scans
+
+        assert [card.listing_id for card in second_scan] == [card.listing_id for card in first_scan]
+        assert [card.price for card in second_scan] == [card.price for card in first_scan]
+        assert {scan_id for scan_id, _ in store.page_fingerprints(search_query).values()} == {2}
+
+
+@pytest.mark.stand_in(num_of_pages=2, cards_per_page=6)
+def test_search_session_refresh_details_on_stand_in(page, stand_in):
+    """
+    Records the booking snapshots of the top rated listings through a session with a listing store,
+    reading each listing once.
+    """
+
+    search_query = SearchQuery("Tel Aviv", datetime(2025, 5, 1), datetime(2025, 5, 3), 2)
+
+    with ListingStore() as store:
+        search_session = SearchSession(stand_in.url, store=store)
+        search_results_page = search_session.search(page, search_query)
+        top_rated = search_session.scan(search_results_page, search_query).top_rated(3)
+
+        assert search_session.refresh_details(search_results_page, search_query, top_rated) == 3
+        assert search_session.refresh_details(search_results_page, search_query, top_rated) == 0
+
+        for card in top_rated:
+            assert store.history(search_query, card.listing_id)[-1]["total_price"] is not None
+
+
+@pytest.mark.stand_in(total_delay=3)
+def test_refresh_details_skips_timed_out_pages_on_stand_in(page, stand_in, monkeypatch):
+    """
+    Checks the details pages that time out before showing their total are not recorded, and are read again.
+    """
+
+    monkeypatch.setattr("pages.search_results.DETAILS_LOAD_TIMEOUT", 1000)
+    search_query = SearchQuery("Tel Aviv", datetime(2025, 5, 1), datetime(2025, 5, 3), 2)
+
+    with ListingStore() as store:
+        HomePage(page, stand_in.url).search(search_query)
+        scan_id = store.start_scan(search_query)
+        search_results_page = SearchResultsPage(page)
+        top_rated = search_results_page.scan_incremental(store, search_query, scan_id).top_rated(2)
+
+        assert search_results_page.refresh_details(store, search_query, scan_id, top_rated) == 0
+
+        for card in top_rated:
+            assert store.history(search_query, card.listing_id)[-1]["total_price"] is None
+            assert store.needs_details(search_query, card)
+
+
+@pytest.mark.stand_in(num_of_pages=3, cards_per_page=6)
+def test_async_pages_on_stand_in(stand_in, browser_name, browser_type_launch_args):
+    """
+    Searches and scans the stand-in with the async page objects.
+
+    The async API runs in a thread of its own, since the sync API of the other tests may hold
+    the event loop of this one.
+    """
+
+    search_query = SearchQuery("Tel Aviv", datetime(2025, 5, 1), datetime(2025, 5, 3), 2)
+
+    async def search_and_scan():
+        async with async_playwright() as playwright:
+            browser = await getattr(playwright, browser_name).launch(**browser_type_launch_args)
+
+            try:
+                page = await browser.new_page()
+                await AsyncHomePage(page, stand_in.url).search(search_query)
+
+                search_results_page = AsyncSearchResultsPage(page)
+                await search_results_page.verify_results(
+                    search_query.location, search_query.check_in_date, search_query.check_out_date, 2
+                )
+
+                rating, _, _ = await search_results_page.find_highest_rated()
+                open_pages = len(page.context.pages)
+
+                return rating, open_pages, await search_results_page.scan(prefetch=True)
+            finally:
+                await browser.close()
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        rating, open_pages, results_scan = executor.submit(asyncio.run, search_and_scan()).result()
+
+    assert [card.listing_id for card in results_scan] == [
+        str(listing_at(stand_in.config, position).id) for position in range(18)
+    ]
+    assert rating == results_scan.highest_rated().rating
+
+    # Stopping at the first top rated card closed the prefetch tab
+    assert open_pages == 1
@@ -0,0 +1,106 @@
+import logging
+import re
+
+# The cookies consent banner that shows up on the first visit, and its accept button
+CONSENT_BANNER_TEST_ID = "main-cookies-banner-container"
+CONSENT_BUTTON_NAME = re.compile(r"^(Accept all|Accept)$")
+CONSENT_TIMEOUT = 3_000  # ms
+
+
+def consent_button(page):
+    # Only the buttons of the banner, so no other "Accept" button is ever clicked
+    return page.get_by_test_id(CONSENT_BANNER_TEST_ID).get_by_role("button", name=CONSENT_BUTTON_NAME).first
+
+
+def dismiss_consent(page):
+    """
+    Accepts the cookies consent banner if it shows up.
+    """
+
+    try:
+        consent_button(page).click(timeout=CONSENT_TIMEOUT)
+    except Exception as e:
+        logging.debug("No consent banner to dismiss: %s", str(e))
+
+
+class ContextPool:
+    """
+    Browser contexts of a single browser, warmed up once and reused by test after test.
+
+    The first context visits the base URL and dismisses the consent banner. Its storage state
+    (cookies and local storage) is then the starting point of every context of the pool.
+    Releasing a context resets it: its pages are closed, its cookies go back to the warm ones,
+    and its routes, headers and permissions are cleared.
+    The HTTP cache and the local storage are kept.
+    """
+
+    def __init__(self, browser, context_args: dict, warm_up_url: str | None = None):
+        self.browser = browser
+        self.context_args = context_args
+        self.warm_up_url = warm_up_url
+        self.storage_state = None
+
+        self._idle = []
+        self._all = []
+
+    def warm_up(self):
+        context = self._new_context()
+
+        if self.warm_up_url:
+            page = context.new_page()
+
+            try:
+                page.goto(self.warm_up_url, wait_until="domcontentloaded")
+                dismiss_consent(page)
+            except Exception as e:
+                logging.warning("Failed to warm up the browser context: %s", str(e))
+            finally:
+                page.close()
+
+        self.storage_state = context.storage_state()
+        self._idle.append(context)
+
+    def _new_context(self):
+        context_args = dict(self.context_args)
+
+        if self.storage_state is not None:
+            context_args["storage_state"] = self.storage_state
+
+        context = self.browser.new_context(**context_args)
+        self._all.append(context)
+
+        return context
+
+    def acquire(self):
+        if self.storage_state is None:
+            self.warm_up()
+
+        return self._idle.pop() if self._idle else self._new_context()
+
+    def release(self, context):
+        try:
+            self.reset(context)
+        except Exception as e:
+            logging.warning("Failed to reset the browser context, closing it: %s", str(e))
+            self._all.remove(context)
+            context.close()
+            return
+
+        self._idle.append(context)
+
+    def reset(self, context):
+        for page in list(context.pages):
+            page.close()
+
+        context.unroute_all(behavior="ignoreErrors")
+        context.clear_cookies()
+        context.add_cookies(self.storage_state["cookies"])
+        context.clear_permissions()
+        context.set_extra_http_headers(self.context_args.get("extra_http_headers", {}))
+
+    def close(self):
+        for context in self._all:
+            context.close()
+
+        self._all = []
+        self._idle = []
@@ -0,0 +1,181 @@
+from array import array
+from typing import Iterable
+from utils.records import CardRecord
+from utils.util import parse_card_price, parse_card_rating, parse_card_reviews, parse_listing_id
+
+# The listing id of the cards without a link to their listing
+NO_LISTING_ID = -1
+
+# The type code of every column (see the array module)
+COLUMN_TYPES = {
+    "listing_ids": "q",
+    "pages": "i",
+    "ratings": "d",
+    "prices": "d",
+    "reviews": "i",
+}
+
+
+def parse_card_texts(texts: Iterable[str]) -> tuple[array, array, array]:
+    """
+    Parses the ratings, prices and numbers of reviews of many cards in one call.
+
+    Args:
+        texts (Iterable[str]): The inner texts of the cards.
+
+    Returns:
+        tuple[array, array, array]: The ratings (-1 if none), the prices (infinity if none)
+                                    and the numbers of reviews, in the order of the texts.
+    """
+
+    texts = list(texts)
+
+    return (
+        array("d", map(parse_card_rating, texts)),
+        array("d", map(parse_card_price, texts)),
+        array("i", map(parse_card_reviews, texts)),
+    )
+
+
+def to_listing_id(url: str | None) -> int:
+    listing_id = parse_listing_id(url)
+    return int(listing_id) if listing_id is not None else NO_LISTING_ID
+
+
+class CardColumns:
+    """
+    The cards of a scan stored column by column in typed arrays: listing ids, page numbers,
+    ratings, prices and numbers of reviews.
+
+    A card takes 32 bytes whatever its text, so whole scans of thousands of listings can be kept
+    for a session. Cards are referred to by their position, in the order they were added.
+    """
+
+    def __init__(self):
+        self.listing_ids = array(COLUMN_TYPES["listing_ids"])
+        self.pages = array(COLUMN_TYPES["pages"])
+        self.ratings = array(COLUMN_TYPES["ratings"])
+        self.prices = array(COLUMN_TYPES["prices"])
+        self.reviews = array(COLUMN_TYPES["reviews"])
+
+    def __len__(self):
+        return len(self.listing_ids)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(column.itemsize * len(column) for column in self.columns().values())
+
+    def columns(self) -> dict[str, array]:
+        return {name: getattr(self, name) for name in COLUMN_TYPES}
+
+    def add_raw(self, raw_cards: list[dict], page: int = 1):
+        """
+        Adds the cards of a results page, parsing them all in one call.
+
+        Args:
+            raw_cards (list[dict]): The cards, as returned by EXTRACT_CARDS_SCRIPT.
+            page (int, optional): The number of the results page. Defaults to 1.
+        """
+
+        ratings, prices, reviews = parse_card_texts(raw_card["text"] for raw_card in raw_cards)
+
+        self.listing_ids.extend(to_listing_id(raw_card["url"]) for raw_card in raw_cards)
+        self.pages.extend([page] * len(raw_cards))
+        self.ratings.extend(ratings)
+        self.prices.extend(prices)
+        self.reviews.extend(reviews)
+
+    def add_cards(self, cards: Iterable[CardRecord]):
+        for card in cards:
+            self.listing_ids.append(int(card.listing_id) if card.listing_id else NO_LISTING_ID)
+            self.pages.append(card.page)
+            self.ratings.append(card.rating)
+            self.prices.append(card.price)
+            self.reviews.append(card.reviews)
+
+    @classmethod
+    def from_cards(cls, cards: Iterable[CardRecord]) -> "CardColumns":
+        card_columns = cls()
+        card_columns.add_cards(cards)
+        return card_columns
+
+    def row(self, position: int) -> dict:
+        return {name: column[position] for name, column in self.columns().items()}
+
+    def take(self, positions: Iterable[int]) -> "CardColumns":
+        """
+        Copies some of the cards.
+
+        Args:
+            positions (Iterable[int]): The positions of the cards to copy, in the order to copy them.
+
+        Returns:
+            CardColumns: The copied cards.
+        """
+
+        positions = list(positions)
+        card_columns = CardColumns()
+
+        for name, column in self.columns().items():
+            getattr(card_columns, name).extend(map(column.__getitem__, positions))
+
+        return card_columns
+
+    def where(
+        self,
+        min_rating: float | None = None,
+        max_price: float | None = None,
+        min_reviews: int | None = None,
+    ) -> array:
+        """
+        Finds the cards that pass all the given conditions.
+
+        Args:
+            min_rating (float, optional): The lowest rating to accept (the cards without a rating fail it).
+            max_price (float, optional): The highest price to accept (the cards without a price fail it).
+            min_reviews (int, optional): The lowest number of reviews to accept.
+
+        Returns:
+            array: The positions of the cards, in order.
+        """
+
+        positions = range(len(self))
+
+        if min_rating is not None:
+            positions = [i for i in positions if self.ratings[i] >= min_rating]
+
+        if max_price is not None:
+            positions = [i for i in positions if self.prices[i] <= max_price]
+
+        if min_reviews is not None:
+            positions = [i for i in positions if self.reviews[i] >= min_reviews]
+
+        return array("i", positions)
+
+    def order_by(
+        self, column: str, descending: bool = False, positions: Iterable[int] | None = None
+    ) -> list[int]:
+        """
+        Sorts the cards by a column. Cards with equal values keep their order.
+
+        Args:
+            column (str): The name of the column, for example "ratings".
+            descending (bool, optional): Sort from the highest value down. Defaults to False.
+            positions (Iterable[int], optional): The positions of the cards to sort. Defaults to all the cards.
+
+        Returns:
+            list[int]: The positions of the cards, sorted.
+        """
+
+        values = getattr(self, column)
+
+        if positions is None:
+            positions = range(len(self))
+
+        return sorted(positions, key=values.__getitem__, reverse=descending)
+
+    def mean(self, column: str, positions: Iterable[int] | None = None) -> float | None:
+        values = getattr(self, column)
+        selected = values if positions is None else [values[i] for i in positions]
+
+        return sum(selected) / len(selected) if len(selected) else None
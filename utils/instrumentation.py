@@ -0,0 +1,239 @@
+import functools
+import inspect
+import json
+from pathlib import Path
+import time
+from playwright.sync_api import Locator, LocatorAssertions, Page
+
+# The Playwright calls to trace, by class. The ones in WAIT_CALLS only wait for the page,
+# and so do the evaluations of the scripts in wait_scripts().
+PLAYWRIGHT_CALLS = {
+    Locator: (
+        "click",
+        "fill",
+        "press",
+        "inner_text",
+        "text_content",
+        "is_visible",
+        "is_enabled",
+        "count",
+        "wait_for",
+        "evaluate",
+        "evaluate_all",
+    ),
+    Page: (
+        "goto",
+        "evaluate",
+        "wait_for_url",
+        "wait_for_event",
+        "wait_for_function",
+        "wait_for_load_state",
+        "wait_for_timeout",
+    ),
+    LocatorAssertions: ("to_contain_text", "to_be_visible", "to_have_text"),
+}
+
+WAIT_CALLS = {
+    "wait_for",
+    "wait_for_url",
+    "wait_for_event",
+    "wait_for_function",
+    "wait_for_load_state",
+    "wait_for_timeout",
+    "to_contain_text",
+    "to_be_visible",
+    "to_have_text",
+}
+
+
+def page_object_classes() -> list[type]:
+    # Imported here since the page objects import the utils
+    from pages.apt_details import AptDetails
+    from pages.home_page import HomePage
+    from pages.reservation_page import ReservationPage
+    from pages.search_results import SearchResultsPage
+
+    return [HomePage, SearchResultsPage, AptDetails, ReservationPage]
+
+
+def wait_scripts() -> set[str]:
+    # Imported here since the page objects import the utils
+    from pages.search_results import WAIT_FOR_CARDS_SCRIPT
+
+    return {WAIT_FOR_CARDS_SCRIPT}
+
+
+class StepTracer:
+    """
+    Records a timeline of the page-object methods and Playwright calls of a test.
+
+    Every step records its start and end (seconds since the test started), its nesting depth,
+    and for page-object steps the number of Playwright calls made and the time spent waiting in them.
+    Nothing is patched until install() is called, so a disabled tracer costs nothing.
+    """
+
+    def __init__(self):
+        self.steps = []
+        self._stack = []
+        self._start = time.perf_counter()
+        self._patches = []
+        self._wait_scripts = set()
+
+    def reset(self):
+        self.steps = []
+        self._stack = []
+        self._start = time.perf_counter()
+
+    def is_wait(self, function, args: tuple) -> bool:
+        if function.__name__ in WAIT_CALLS:
+            return True
+
+        # An evaluation of a script that waits, for example Page.evaluate(WAIT_FOR_CARDS_SCRIPT, ...)
+        return function.__name__ == "evaluate" and len(args) > 1 and args[1] in self._wait_scripts
+
+    def start_step(self, name: str, kind: str) -> dict:
+        return {
+            "name": name,
+            "kind": kind,
+            "depth": len(self._stack),
+            "start": time.perf_counter() - self._start,
+            "calls": 0,
+            "wait": 0.0,
+        }
+
+    def end_step(self, step: dict, duration: float, is_wait: bool = False):
+        step["end"] = time.perf_counter() - self._start
+        step["duration"] = duration
+
+        if step["kind"] == "playwright":
+            for parent in self._stack:
+                parent["calls"] += 1
+
+                if is_wait:
+                    parent["wait"] += duration
+
+        self.steps.append(step)
+
+    def wrap(self, function, name: str, kind: str):
+        tracer = self
+
+        @functools.wraps(function)
+        def traced(*args, **kwargs):
+            # Playwright calls made by other Playwright calls are part of them
+            if kind == "playwright" and tracer._stack and tracer._stack[-1]["kind"] == "playwright":
+                return function(*args, **kwargs)
+
+            step = tracer.start_step(name, kind)
+            started = time.perf_counter()
+            result = None
+
+            tracer._stack.append(step)
+
+            try:
+                result = function(*args, **kwargs)
+            finally:
+                tracer._stack.pop()
+                duration = time.perf_counter() - started
+
+                if not inspect.isgenerator(result):
+                    tracer.end_step(step, duration, kind == "playwright" and tracer.is_wait(function, args))
+
+            if inspect.isgenerator(result):
+                return tracer.trace_generator(result, step, duration)
+
+            return result
+
+        return traced
+
+    def trace_generator(self, generator, step: dict, duration: float):
+        """
+        Times the iteration of a generator returned by a page-object method (for example iter_pages).
+
+        The step adds up the time spent in the generator, every time it is resumed, and ends
+        when the generator is exhausted or closed. The time between the items is the caller's.
+        """
+
+        try:
+            while True:
+                resumed = time.perf_counter()
+                self._stack.append(step)
+
+                try:
+                    item = next(generator)
+                except StopIteration as stop:
+                    return stop.value
+                finally:
+                    self._stack.pop()
+                    duration += time.perf_counter() - resumed
+
+                yield item
+        finally:
+            generator.close()
+            self.end_step(step, duration)
+
+    def patch(self, cls: type, attribute: str, kind: str):
+        original = vars(cls)[attribute]
+        self._patches.append((cls, attribute, original))
+        setattr(cls, attribute, self.wrap(original, f"{cls.__name__}.{attribute}", kind))
+
+    def install(self):
+        """
+        Wraps the public methods of the page objects and the Playwright calls they make.
+        """
+
+        self._wait_scripts = wait_scripts()
+        patched = set()
+
+        # The methods of the base classes too, once for all the classes sharing them
+        for page_object_class in page_object_classes():
+            for cls in page_object_class.__mro__[:-1]:
+                for attribute, value in list(vars(cls).items()):
+                    if callable(value) and not attribute.startswith("_") and (cls, attribute) not in patched:
+                        self.patch(cls, attribute, "page")
+                        patched.add((cls, attribute))
+
+        for cls, attributes in PLAYWRIGHT_CALLS.items():
+            for attribute in attributes:
+                if attribute in vars(cls):
+                    self.patch(cls, attribute, "playwright")
+
+    def uninstall(self):
+        for cls, attribute, original in reversed(self._patches):
+            setattr(cls, attribute, original)
+
+        self._patches = []
+
+    def timeline(self) -> list[dict]:
+        timeline = sorted(self.steps, key=lambda step: step["start"])
+
+        for step in timeline:
+            if step["kind"] == "page":
+                step["work"] = step["duration"] - step["wait"]
+
+        return timeline
+
+    def save(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.timeline(), indent=2))
+
+
+def slowest_steps(timelines: dict[str, list[dict]], top: int = 10) -> list[dict]:
+    """
+    Finds the slowest page-object steps of all the tests.
+
+    Args:
+        timelines (dict[str, list[dict]]): The timeline of every test, by test id.
+        top (int, optional): The number of steps to return. Defaults to 10.
+
+    Returns:
+        list[dict]: The steps, slowest first, each with the id of its test.
+    """
+
+    steps = [
+        {**step, "test": test_id}
+        for test_id, timeline in timelines.items()
+        for step in timeline
+        if step["kind"] == "page"
+    ]
+
+    return sorted(steps, key=lambda step: step["duration"], reverse=True)[:top]
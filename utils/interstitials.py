@@ -0,0 +1,92 @@
+from collections import Counter
+from dataclasses import dataclass
+import logging
+import re
+from typing import Callable
+from utils.browser_pool import consent_button
+
+
+@dataclass(frozen=True)
+class Interstitial:
+    """
+    An overlay that may show up over a page, and how to get rid of it.
+
+    Attributes:
+        name (str): The name of the overlay.
+        locator (Callable): Gets the locator of the overlay in a page.
+        dismiss (Callable): Dismisses the overlay, given its locator.
+    """
+
+    name: str
+    locator: Callable
+    dismiss: Callable
+
+
+def dialog_with_heading(name):
+    return lambda page: page.get_by_role("dialog").filter(has=page.get_by_role("heading", name=name))
+
+
+def close_dialog(dialog):
+    dialog.get_by_role("button", name="Close").first.click()
+
+
+# The overlays the tests get rid of whenever they show up
+INTERSTITIALS = {
+    "translation": Interstitial("translation", dialog_with_heading("Translation on"), close_dialog),
+    "consent": Interstitial("consent", consent_button, lambda button: button.click()),
+    "login": Interstitial(
+        "login", dialog_with_heading(re.compile(r"^(Log in or sign up|Welcome to Airbnb)$")), close_dialog
+    ),
+}
+
+
+class InterstitialHandlers:
+    """
+    Dismisses overlays (translation popup, cookie consent, login nag) when they show up,
+    with page.add_locator_handler.
+
+    Playwright checks for the overlays before every action and auto-waiting assertion,
+    so nothing waits for an overlay that doesn't show up.
+    """
+
+    def __init__(self, interstitials=tuple(INTERSTITIALS.values())):
+        self.interstitials = tuple(interstitials)
+
+        # The number of times every overlay was dismissed
+        self.dismissed = Counter()
+
+    def dismiss(self, interstitial: Interstitial, locator):
+        logging.info(f"Dismissing the {interstitial.name} overlay.")
+
+        try:
+            interstitial.dismiss(locator)
+            self.dismissed[interstitial.name] += 1
+        except Exception as e:
+            logging.debug("Failed to dismiss the %s overlay: %s", interstitial.name, str(e))
+
+    def attach(self, page):
+        for interstitial in self.interstitials:
+            page.add_locator_handler(
+                interstitial.locator(page),
+                lambda locator, interstitial=interstitial: self.dismiss(interstitial, locator),
+            )
+
+    def detach(self, page):
+        for interstitial in self.interstitials:
+            page.remove_locator_handler(interstitial.locator(page))
+
+    def apply(self, context):
+        """
+        Attaches the handlers to every page of a browser context, including the pages opened later.
+        """
+
+        for page in context.pages:
+            self.attach(page)
+
+        context.on("page", self.attach)
+
+    def remove(self, context):
+        context.remove_listener("page", self.attach)
+
+        for page in context.pages:
+            self.detach(page)
@@ -0,0 +1,47 @@
+from functools import reduce
+
+
+def visible(locator):
+    # The first visible match: a variant can be in the DOM, hidden, in the layout of another one
+    return locator.filter(visible=True).first
+
+
+def combined_locator(variants: dict):
+    return visible(reduce(lambda combined, locator: combined.or_(locator), variants.values()))
+
+
+def detect_layout(variants: dict, timeout: float | None = None) -> str:
+    """
+    Waits for whichever layout of a page shows up first, with a single wait on all of them.
+
+    Args:
+        variants (dict[str, Locator]): The locator that tells every layout apart, by the layout's name,
+                                       in order of priority (when several show up, the first one wins).
+        timeout (float, optional): The time to wait in ms. Defaults to Playwright's default timeout.
+
+    Returns:
+        str: The name of the layout.
+    """
+
+    combined_locator(variants).wait_for(state="visible", timeout=timeout)
+
+    for name, locator in variants.items():
+        if visible(locator).is_visible():
+            return name
+
+    # The layout that showed up is gone already, so the page is changing: go with the first one
+    return next(iter(variants))
+
+
+async def async_detect_layout(variants: dict, timeout: float | None = None) -> str:
+    """
+    The async counterpart of detect_layout.
+    """
+
+    await combined_locator(variants).wait_for(state="visible", timeout=timeout)
+
+    for name, locator in variants.items():
+        if await visible(locator).is_visible():
+            return name
+
+    return next(iter(variants))
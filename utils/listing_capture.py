@@ -0,0 +1,260 @@
+import base64
+import logging
+import re
+import time
+from urllib.parse import urljoin
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from conftest import CAPTURE_POLL_INTERVAL, CARD_LOAD_TIMEOUT
+from utils.records import CardRecord
+from utils.results_scan import ResultsScan
+from utils.util import PRICE_REGEX, parse_card_rating, parse_card_reviews
+
+# The search data requests of the results page
+SEARCH_RESPONSE_REGEX = re.compile(r"/api/v3/StaysSearch")
+
+# The rating in the short form, for example "4.93 (150)"
+LOCALIZED_RATING_REGEX = re.compile(r"(\d\.\d+)\s*\(([\d,]+)\)")
+
+
+def decode_listing_id(listing_id: str | None) -> str | None:
+    """
+    Decodes a listing id, that may come base64 encoded (for example "DemandStayListing:12345").
+
+    Args:
+        listing_id (str | None): The id, as it appears in the response.
+
+    Returns:
+        str | None: The numeric id of the listing, or None if it could not be decoded.
+    """
+
+    if not listing_id:
+        return None
+
+    if listing_id.isdigit():
+        return listing_id
+
+    try:
+        decoded = base64.b64decode(listing_id).decode()
+    except ValueError:
+        return None
+
+    _, _, numeric_id = decoded.rpartition(":")
+
+    return numeric_id if numeric_id.isdigit() else None
+
+
+def parse_search_result(
+    result: dict, index: int, page: int = 1, page_url: str | None = None
+) -> CardRecord:
+    """
+    Builds a record from one search result of a search data response.
+
+    Args:
+        result (dict): The search result.
+        index (int): The position of the result in its page.
+        page (int, optional): The number of the results page. Defaults to 1.
+        page_url (str, optional): The URL of the results page.
+
+    Returns:
+        CardRecord: The listing, with the same conventions as a card read from the page
+                    (rating -1 and price infinity when missing).
+    """
+
+    listing = result.get("listing") or {}
+
+    listing_id = decode_listing_id(listing.get("id")) or decode_listing_id(
+        (result.get("demandStayListing") or {}).get("id")
+    )
+
+    # The rating, either "4.93 out of 5 average rating, 150 reviews" or "4.93 (150)"
+    rating_label = result.get("avgRatingA11yLabel") or listing.get("avgRatingA11yLabel") or ""
+    rating = parse_card_rating(rating_label)
+    reviews = parse_card_reviews(rating_label)
+
+    localized_rating = result.get("avgRatingLocalized") or listing.get("avgRatingLocalized") or ""
+    match_localized = LOCALIZED_RATING_REGEX.search(localized_rating)
+
+    if rating == -1 and match_localized:
+        rating = float(match_localized.group(1))
+        reviews = int(match_localized.group(2).replace(",", ""))
+
+    # The price of the primary line, the discounted one when there is a discount
+    display_price = result.get("structuredDisplayPrice") or (
+        (result.get("pricingQuote") or {}).get("structuredStayDisplayPrice") or {}
+    )
+    primary_line = display_price.get("primaryLine") or {}
+    price_text = primary_line.get("discountedPrice") or primary_line.get("price") or ""
+
+    price = float("inf")
+    match_price = PRICE_REGEX.search(price_text)
+
+    if match_price:
+        price = float(match_price.group(1).replace(",", ""))
+
+    url = urljoin(page_url, f"/rooms/{listing_id}") if listing_id and page_url else None
+
+    return CardRecord(
+        index=index,
+        text=result.get("title") or listing.get("name") or "",
+        url=url,
+        rating=rating,
+        price=price,
+        page=page,
+        page_url=page_url,
+        listing_id=listing_id,
+        reviews=reviews,
+    )
+
+
+def parse_search_response(
+    data: dict, page: int = 1, page_url: str | None = None
+) -> list[CardRecord]:
+    """
+    Builds the records of all the listings in a search data response.
+
+    Args:
+        data (dict): The JSON body of the response.
+        page (int, optional): The number of the results page. Defaults to 1.
+        page_url (str, optional): The URL of the results page.
+
+    Returns:
+        list[CardRecord]: The listings, in the order of the results page.
+    """
+
+    results = (
+        ((data.get("data") or {}).get("presentation") or {}).get("staysSearch") or {}
+    ).get("results") or {}
+
+    search_results = [
+        result
+        for result in results.get("searchResults") or []
+        if result.get("listing") or result.get("demandStayListing")
+    ]
+
+    return [
+        parse_search_result(result, index, page, page_url)
+        for index, result in enumerate(search_results)
+    ]
+
+
+def page_number_of(data: dict, cursor: str | None) -> int | None:
+    """
+    Finds the number of the results page a search data response belongs to.
+
+    Args:
+        data (dict): The JSON body of the response.
+        cursor (str | None): The pagination cursor of the request (None for the first page).
+
+    Returns:
+        int | None: The page number, or None if the cursor is not one of the response's pages.
+    """
+
+    if not cursor:
+        return 1
+
+    results = (
+        ((data.get("data") or {}).get("presentation") or {}).get("staysSearch") or {}
+    ).get("results") or {}
+    page_cursors = (results.get("paginationInfo") or {}).get("pageCursors") or []
+
+    if cursor in page_cursors:
+        return page_cursors.index(cursor) + 1
+
+    return None
+
+
+class ListingCapture:
+    """
+    Builds listing records from the search data responses of the results page, as they arrive,
+    so the results can be aggregated without querying the page.
+
+    Usage:
+        capture = ListingCapture()
+        capture.attach(page)
+        ... search, then page through the results ...
+        results_scan = capture.to_scan()
+    """
+
+    def __init__(self, url_regex: re.Pattern = SEARCH_RESPONSE_REGEX):
+        self.url_regex = url_regex
+
+        # The listings of every captured page, by page number
+        self.pages: dict[int, list[CardRecord]] = {}
+
+        self._page = None
+
+    def attach(self, page):
+        self._page = page
+        page.on("response", self.on_response)
+
+    def detach(self):
+        if self._page is not None:
+            self._page.remove_listener("response", self.on_response)
+            self._page = None
+
+    def matches(self, response) -> bool:
+        return bool(self.url_regex.search(response.url)) and response.ok
+
+    def on_response(self, response):
+        if not self.matches(response):
+            return
+
+        try:
+            data = response.json()
+            request_data = response.request.post_data_json or {}
+        except Exception as e:
+            logging.debug("Failed to read search response: %s", str(e))
+            return
+
+        cursor = (
+            ((request_data.get("variables") or {}).get("staysSearchRequest") or {}).get("cursor")
+        )
+
+        self.add(data, page_number_of(data, cursor), self._page.url if self._page else None)
+
+    def add(self, data: dict, page: int | None = None, page_url: str | None = None):
+        """
+        Adds the listings of a search data response.
+
+        Args:
+            data (dict): The JSON body of the response.
+            page (int, optional): The number of the results page, the next page when not known.
+            page_url (str, optional): The URL of the results page.
+        """
+
+        if page is None:
+            page = max(self.pages, default=0) + 1
+
+        self.pages[page] = parse_search_response(data, page, page_url)
+
+    def wait_for_page(self, number: int, timeout: float = CARD_LOAD_TIMEOUT):
+        """
+        Waits until the listings of a results page were captured.
+
+        The responses are parsed by on_response, which may still be reading a body when its
+        response event is over, so the captured pages are checked until the page shows up.
+
+        Args:
+            number (int): The page number.
+            timeout (float, optional): The time to wait, in ms.
+
+        Raises:
+            TimeoutError: If the page wasn't captured in time (Playwright's TimeoutError).
+        """
+
+        deadline = time.monotonic() + timeout / 1000
+
+        while number not in self.pages:
+            if time.monotonic() > deadline:
+                raise PlaywrightTimeoutError(f"Timed out waiting for the search data of page {number}.")
+
+            # Lets the response handlers run in the meantime
+            self._page.wait_for_timeout(CAPTURE_POLL_INTERVAL)
+
+    def to_scan(self) -> ResultsScan:
+        results_scan = ResultsScan()
+
+        for number in sorted(self.pages):
+            results_scan.add(self.pages[number])
+
+        return results_scan
@@ -0,0 +1,267 @@
+from datetime import datetime, timezone
+import sqlite3
+from utils.records import BookingSnapshot, CardRecord
+from utils.search_query import SearchQuery
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scans (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    location TEXT NOT NULL,
+    check_in TEXT NOT NULL,
+    check_out TEXT NOT NULL,
+    adults INTEGER NOT NULL,
+    children INTEGER NOT NULL,
+    scanned_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scans_by_search
+    ON scans (location, check_in, check_out, adults, children, scanned_at);
+
+CREATE TABLE IF NOT EXISTS pages (
+    scan_id INTEGER NOT NULL REFERENCES scans (id),
+    page INTEGER NOT NULL,
+    url TEXT,
+    fingerprint TEXT NOT NULL,
+    PRIMARY KEY (scan_id, page)
+);
+
+CREATE TABLE IF NOT EXISTS listings (
+    scan_id INTEGER NOT NULL REFERENCES scans (id),
+    page INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    listing_id TEXT,
+    url TEXT,
+    text TEXT NOT NULL,
+    rating REAL NOT NULL,
+    price REAL NOT NULL,
+    reviews INTEGER NOT NULL,
+    PRIMARY KEY (scan_id, page, position)
+);
+CREATE INDEX IF NOT EXISTS listings_by_id ON listings (listing_id, scan_id);
+
+CREATE TABLE IF NOT EXISTS snapshots (
+    scan_id INTEGER NOT NULL REFERENCES scans (id),
+    listing_id TEXT NOT NULL,
+    check_in TEXT NOT NULL,
+    check_out TEXT NOT NULL,
+    guests INTEGER NOT NULL,
+    nightly_price REAL,
+    total_price INTEGER,
+    reserve_enabled INTEGER NOT NULL,
+    PRIMARY KEY (scan_id, listing_id)
+);
+CREATE INDEX IF NOT EXISTS snapshots_by_id ON snapshots (listing_id, scan_id);
+"""
+
+# The columns of a search in the scans table, in the order of search_values()
+SEARCH_COLUMNS = (
+    "scans.location = ? AND scans.check_in = ? AND scans.check_out = ?"
+    " AND scans.adults = ? AND scans.children = ?"
+)
+
+
+def search_values(query: SearchQuery) -> tuple:
+    return (
+        query.location,
+        query.check_in_date.strftime("%Y-%m-%d"),
+        query.check_out_date.strftime("%Y-%m-%d"),
+        query.num_of_adults,
+        query.num_of_children,
+    )
+
+
+class ListingStore:
+    """
+    A SQLite store of the scanned search results and the booking snapshots of their details pages.
+
+    Every scan of a search is kept with its time, so the prices and ratings of a listing can be
+    followed from run to run. The fingerprint of every results page is kept too, so the next scan
+    can reuse the cards of the pages that didn't change (see SearchResultsPage.scan_incremental).
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # Writing
+
+    def start_scan(self, query: SearchQuery, scanned_at: datetime | None = None) -> int:
+        """
+        Starts recording a scan of a search.
+
+        Args:
+            query (SearchQuery): The search.
+            scanned_at (datetime, optional): The time of the scan. Defaults to now.
+
+        Returns:
+            int: The id of the scan.
+        """
+
+        scanned_at = scanned_at or datetime.now(timezone.utc)
+
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO scans (location, check_in, check_out, adults, children, scanned_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (*search_values(query), scanned_at.isoformat()),
+            )
+
+        return cursor.lastrowid
+
+    def add_page(
+        self, scan_id: int, page: int, url: str | None, fingerprint: str, cards: list[CardRecord]
+    ):
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO pages (scan_id, page, url, fingerprint) VALUES (?, ?, ?, ?)",
+                (scan_id, page, url, fingerprint),
+            )
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO listings"
+                " (scan_id, page, position, listing_id, url, text, rating, price, reviews)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        scan_id,
+                        page,
+                        card.index,
+                        card.listing_id,
+                        card.url,
+                        card.text,
+                        card.rating,
+                        card.price,
+                        card.reviews,
+                    )
+                    for card in cards
+                ],
+            )
+
+    def add_snapshot(self, scan_id: int, listing_id: str, snapshot: BookingSnapshot):
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO snapshots"
+                " (scan_id, listing_id, check_in, check_out, guests, nightly_price, total_price, reserve_enabled)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    scan_id,
+                    listing_id,
+                    snapshot.check_in_date.strftime("%Y-%m-%d"),
+                    snapshot.check_out_date.strftime("%Y-%m-%d"),
+                    snapshot.guests,
+                    snapshot.nightly_price,
+                    snapshot.total_price,
+                    snapshot.reserve_enabled,
+                ),
+            )
+
+    # Reading
+
+    def page_fingerprints(self, query: SearchQuery) -> dict[int, tuple[int, str]]:
+        """
+        Gets the fingerprint of every results page of a search, as of the last scan that read the page.
+
+        Args:
+            query (SearchQuery): The search.
+
+        Returns:
+            dict[int, tuple[int, str]]: The scan id and the fingerprint, by page number.
+        """
+
+        # SQLite takes the fingerprint from the row of the last scan
+        rows = self.connection.execute(
+            "SELECT pages.page, MAX(pages.scan_id) AS scan_id, pages.fingerprint FROM pages"
+            f" JOIN scans ON scans.id = pages.scan_id WHERE {SEARCH_COLUMNS} GROUP BY pages.page",
+            search_values(query),
+        ).fetchall()
+
+        return {row["page"]: (row["scan_id"], row["fingerprint"]) for row in rows}
+
+    def page_cards(self, scan_id: int, page: int) -> list[CardRecord]:
+        """
+        Gets the cards of a results page as recorded by a scan.
+
+        Args:
+            scan_id (int): The id of the scan.
+            page (int): The page number.
+
+        Returns:
+            list[CardRecord]: The cards, in the order of the page.
+        """
+
+        page_url = self.connection.execute(
+            "SELECT url FROM pages WHERE scan_id = ? AND page = ?", (scan_id, page)
+        ).fetchone()
+
+        rows = self.connection.execute(
+            "SELECT * FROM listings WHERE scan_id = ? AND page = ? ORDER BY position", (scan_id, page)
+        ).fetchall()
+
+        return [
+            CardRecord(
+                index=row["position"],
+                text=row["text"],
+                url=row["url"],
+                rating=row["rating"],
+                price=row["price"],
+                page=page,
+                page_url=page_url["url"] if page_url else None,
+                listing_id=row["listing_id"],
+                reviews=row["reviews"],
+            )
+            for row in rows
+        ]
+
+    def history(self, query: SearchQuery, listing_id: str) -> list[dict]:
+        """
+        Follows a listing across the scans of a search.
+
+        Args:
+            query (SearchQuery): The search.
+            listing_id (str): The id of the listing.
+
+        Returns:
+            list[dict]: The "scanned_at", "rating", "price" and "total_price" (None if its details
+                        weren't read in that scan) of the listing in every scan, oldest first.
+        """
+
+        rows = self.connection.execute(
+            "SELECT scans.scanned_at, listings.rating, listings.price, snapshots.total_price FROM listings"
+            " JOIN scans ON scans.id = listings.scan_id"
+            " LEFT JOIN snapshots ON snapshots.scan_id = listings.scan_id"
+            " AND snapshots.listing_id = listings.listing_id"
+            f" WHERE listings.listing_id = ? AND {SEARCH_COLUMNS} ORDER BY scans.id",
+            (listing_id, *search_values(query)),
+        ).fetchall()
+
+        return [dict(row) for row in rows]
+
+    def needs_details(self, query: SearchQuery, card: CardRecord) -> bool:
+        """
+        Decides whether the details page of a card should be read again.
+
+        Args:
+            query (SearchQuery): The search the card was found by.
+            card (CardRecord): The card, as just scanned.
+
+        Returns:
+            bool: True if the listing has no snapshot yet, or if its card changed since the last snapshot.
+        """
+
+        row = self.connection.execute(
+            "SELECT listings.rating, listings.price FROM snapshots"
+            " JOIN listings ON listings.scan_id = snapshots.scan_id AND listings.listing_id = snapshots.listing_id"
+            " JOIN scans ON scans.id = snapshots.scan_id"
+            f" WHERE snapshots.listing_id = ? AND {SEARCH_COLUMNS} ORDER BY snapshots.scan_id DESC LIMIT 1",
+            (card.listing_id, *search_values(query)),
+        ).fetchone()
+
+        return row is None or (row["rating"], row["price"]) != (card.rating, card.price)
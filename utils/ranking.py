@@ -0,0 +1,119 @@
+import heapq
+from itertools import count
+from typing import Callable, Iterable
+from utils.records import CardRecord
+
+# The number of reviews a listing needs to be ranked by its rating with reviews
+MIN_REVIEWS = 10
+
+
+# The scores of the cards in every ranking (higher is better), None for the cards it leaves out
+
+
+def rating_score(card: CardRecord) -> float | None:
+    return card.rating if card.rating >= 0 else None
+
+
+def price_score(card: CardRecord) -> float | None:
+    return -card.price if card.price != float("inf") else None
+
+
+def value_score(card: CardRecord) -> float | None:
+    if card.rating < 0 or not 0 < card.price < float("inf"):
+        return None
+
+    return card.rating / card.price
+
+
+def reviewed_rating_score(min_reviews: int = MIN_REVIEWS) -> Callable[[CardRecord], float | None]:
+    def score(card: CardRecord) -> float | None:
+        return rating_score(card) if card.reviews >= min_reviews else None
+
+    return score
+
+
+class TopK:
+    """
+    The k best cards seen so far by some score, kept in a heap of at most k cards.
+
+    Ties are broken by the order the cards were added in (earlier cards first).
+    """
+
+    def __init__(self, k: int, score: Callable[[CardRecord], float | None]):
+        self.k = k
+        self.score = score
+
+        # The worst of the k best cards is at the top: the lowest score, and the latest of equal ones
+        self._heap = []
+        self._order = count()
+
+    def add(self, card: CardRecord):
+        score = self.score(card)
+
+        if score is None or self.k <= 0:
+            return
+
+        entry = (score, -next(self._order), card)
+
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def results(self) -> list[CardRecord]:
+        return [card for _, _, card in sorted(self._heap, key=lambda entry: entry[:2], reverse=True)]
+
+
+def top_k(cards: Iterable[CardRecord], k: int, score: Callable[[CardRecord], float | None]) -> list[CardRecord]:
+    """
+    Finds the k best cards by a score, in a single pass.
+
+    Args:
+        cards (Iterable[CardRecord]): The cards, in the order of the results.
+        k (int): The number of cards to return.
+        score (Callable[[CardRecord], float | None]): The score of a card (higher is better),
+                                                      None for the cards to leave out.
+
+    Returns:
+        list[CardRecord]: The cards, from the best down.
+    """
+
+    best = TopK(k, score)
+
+    for card in cards:
+        best.add(card)
+
+    return best.results()
+
+
+class Ranker:
+    """
+    Shortlists of the k best cards by rating, price, rating with enough reviews, and rating per price,
+    all built in a single pass over the cards.
+
+    Only the shortlists are kept, so the memory used doesn't grow with the number of cards.
+    """
+
+    def __init__(self, k: int = 5, min_reviews: int = MIN_REVIEWS):
+        self.rankings = {
+            "rating": TopK(k, rating_score),
+            "price": TopK(k, price_score),
+            "reviewed_rating": TopK(k, reviewed_rating_score(min_reviews)),
+            "value": TopK(k, value_score),
+        }
+
+    def add(self, cards: Iterable[CardRecord]):
+        for card in cards:
+            for ranking in self.rankings.values():
+                ranking.add(card)
+
+    def results(self) -> dict[str, list[CardRecord]]:
+        """
+        Gets the shortlists.
+
+        Returns:
+            dict[str, list[CardRecord]]: The cards of every ranking ("rating", "price",
+                                         "reviewed_rating" and "value"), from the best down.
+        """
+
+        return {name: ranking.results() for name, ranking in self.rankings.items()}
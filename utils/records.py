@@ -0,0 +1,121 @@
+from dataclasses import dataclass
+from datetime import datetime
+from utils.util import (
+    parse_card_price,
+    parse_card_rating,
+    parse_card_reviews,
+    parse_listing_id,
+    parse_nightly_price,
+    parse_total_price,
+    parse_trip_dates,
+    parse_trip_guests,
+)
+
+
+@dataclass
+class CardRecord:
+    """
+    A parsed search result card.
+
+    Attributes:
+        index (int): The position of the card in its results page.
+        text (str): The inner text of the card.
+        url (str | None): The link to the listing's details page.
+        rating (float | int): The rating of the listing, -1 if it has none.
+        price (float): The price of the listing, infinity if it has none.
+        page (int): The number of the results page the card is in.
+        page_url (str | None): The URL of the results page the card is in (with its pagination cursor).
+        listing_id (str | None): The id of the listing, taken from its link.
+        reviews (int): The number of reviews of the listing.
+    """
+
+    index: int
+    text: str
+    url: str | None
+    rating: float | int
+    price: float
+    page: int = 1
+    page_url: str | None = None
+    listing_id: str | None = None
+    reviews: int = 0
+
+    @classmethod
+    def from_raw(
+        cls, raw: dict, page: int = 1, page_url: str | None = None
+    ) -> "CardRecord":
+        """
+        Builds a record from the raw card data extracted in the browser.
+
+        Args:
+            raw (dict): A dictionary with the card's "index", "text" and "url".
+            page (int, optional): The number of the results page the card is in. Defaults to 1.
+            page_url (str, optional): The URL of the results page the card is in.
+
+        Returns:
+            CardRecord: The parsed card.
+        """
+
+        text = raw["text"]
+
+        return cls(
+            index=raw["index"],
+            text=text,
+            url=raw["url"],
+            rating=parse_card_rating(text),
+            price=parse_card_price(text),
+            page=page,
+            page_url=page_url,
+            listing_id=parse_listing_id(raw["url"]),
+            reviews=parse_card_reviews(text),
+        )
+
+
+@dataclass
+class BookingSnapshot:
+    """
+    The state of the booking panel of an apartment details page.
+
+    Attributes:
+        check_in_date (datetime): The check-in date.
+        check_out_date (datetime): The check-out date.
+        guests (int): The number of guests.
+        nightly_price (float | None): The price of a night, None if not shown.
+        total_price (int | None): The total price, None if not shown (before dates are chosen).
+        reserve_enabled (bool): Whether the reserve button is there and enabled.
+    """
+
+    check_in_date: datetime
+    check_out_date: datetime
+    guests: int
+    nightly_price: float | None
+    total_price: int | None
+    reserve_enabled: bool
+
+    @classmethod
+    def from_raw(cls, raw: dict) -> "BookingSnapshot":
+        """
+        Builds a snapshot from the raw panel data extracted in the browser.
+
+        Args:
+            raw (dict): A dictionary with the texts of the panel, as returned by BOOKING_SNAPSHOT_SCRIPT.
+
+        Returns:
+            BookingSnapshot: The parsed snapshot.
+
+        Raises:
+            ValueError: If the dates or the number of guests are missing.
+        """
+
+        if raw["datesText"] is None or raw["guestsText"] is None:
+            raise ValueError("Could not find the dates or the guests in the booking panel.")
+
+        check_in_date, check_out_date = parse_trip_dates(raw["datesText"])
+
+        return cls(
+            check_in_date=check_in_date,
+            check_out_date=check_out_date,
+            guests=parse_trip_guests(raw["guestsText"]),
+            nightly_price=parse_nightly_price(raw["panelText"]),
+            total_price=parse_total_price(raw["totalText"]) if raw["totalText"] else None,
+            reserve_enabled=raw["reserveEnabled"],
+        )
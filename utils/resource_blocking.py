@@ -0,0 +1,140 @@
+from collections import Counter
+from urllib.parse import urlparse
+
+# Hosts that serve the site itself (muscache.com serves Airbnb's scripts and styles)
+FIRST_PARTY_DOMAINS = ("airbnb.com", "muscache.com", "localhost", "127.0.0.1")
+
+# Analytics, ads and tag managers, none of them is needed to read the pages
+TRACKER_DOMAINS = (
+    "doubleclick.net",
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googleadservices.com",
+    "facebook.net",
+    "facebook.com",
+    "bing.com",
+    "pinterest.com",
+    "tiktok.com",
+    "branch.io",
+    "sentry.io",
+    "datadoghq.com",
+    "onetrust.com",
+)
+
+
+def matches_domain(host: str, domains) -> bool:
+    return any(host == domain or host.endswith("." + domain) for domain in domains)
+
+
+class ResourcePolicy:
+    """
+    A policy of which requests to abort while browsing, applied to a browser context with context.route.
+
+    The page objects only read text, so images, fonts, media and trackers can be blocked
+    to make the pages load faster. Documents are never blocked.
+    """
+
+    PRESETS = {
+        "none": {},
+        "text-only": {
+            "blocked_types": ("image", "font", "media"),
+            "blocked_domains": TRACKER_DOMAINS,
+        },
+        "no-third-party": {"block_third_party": True},
+    }
+
+    def __init__(
+        self,
+        blocked_types=(),
+        blocked_domains=(),
+        block_third_party: bool = False,
+        first_party_domains=FIRST_PARTY_DOMAINS,
+    ):
+        self.blocked_types = set(blocked_types)
+        self.blocked_domains = tuple(blocked_domains)
+        self.block_third_party = block_third_party
+        self.first_party_domains = tuple(first_party_domains)
+
+        # The number of blocked and allowed requests, by resource type
+        self.blocked = Counter()
+        self.allowed = Counter()
+
+    @classmethod
+    def preset(cls, name: str, **overrides) -> "ResourcePolicy":
+        """
+        Builds a policy from a preset.
+
+        Args:
+            name (str): One of "none", "text-only" and "no-third-party".
+            **overrides: Arguments of the policy that replace the preset's.
+
+        Returns:
+            ResourcePolicy: The policy.
+
+        Raises:
+            ValueError: If there is no such preset.
+        """
+
+        if name not in cls.PRESETS:
+            raise ValueError(f"Unknown resource policy: {name}")
+
+        return cls(**{**cls.PRESETS[name], **overrides})
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.blocked_types or self.blocked_domains or self.block_third_party)
+
+    def should_block(self, url: str, resource_type: str) -> bool:
+        """
+        Decides whether a request should be aborted.
+
+        Args:
+            url (str): The URL of the request.
+            resource_type (str): The resource type of the request, as reported by Playwright.
+
+        Returns:
+            bool: True if the request should be aborted.
+        """
+
+        if resource_type == "document":
+            return False
+
+        if resource_type in self.blocked_types:
+            return True
+
+        host = urlparse(url).hostname or ""
+
+        if matches_domain(host, self.blocked_domains):
+            return True
+
+        return self.block_third_party and not matches_domain(host, self.first_party_domains)
+
+    def handle_route(self, route):
+        request = route.request
+
+        if self.should_block(request.url, request.resource_type):
+            self.blocked[request.resource_type] += 1
+            route.abort("blockedbyclient")
+        else:
+            self.allowed[request.resource_type] += 1
+            route.fallback()
+
+    def apply(self, context):
+        context.route("**/*", self.handle_route)
+
+    def remove(self, context):
+        context.unroute("**/*", self.handle_route)
+
+    def report(self) -> str:
+        """
+        Summarizes the blocked requests.
+
+        Returns:
+            str: For example "Blocked 120 of 300 requests (image: 100, font: 20)".
+        """
+
+        total_blocked = sum(self.blocked.values())
+        total = total_blocked + sum(self.allowed.values())
+        by_type = ", ".join(f"{kind}: {count}" for kind, count in self.blocked.most_common())
+
+        return f"Blocked {total_blocked} of {total} requests ({by_type or 'none'})"
@@ -0,0 +1,124 @@
+from utils.card_columns import CardColumns
+from utils.ranking import (
+    MIN_REVIEWS,
+    Ranker,
+    price_score,
+    rating_score,
+    reviewed_rating_score,
+    top_k,
+    value_score,
+)
+from utils.records import CardRecord
+
+
+class ResultsScan:
+    """
+    All the cards read in one pass over the search results pages.
+
+    Once built, it answers any number of aggregate queries without touching the browser.
+    Ties are always broken by the position of the card in the results (earlier cards first).
+    """
+
+    def __init__(self, cards: list[CardRecord] | None = None):
+        self.cards = list(cards or [])
+
+    def __len__(self):
+        return len(self.cards)
+
+    def __iter__(self):
+        return iter(self.cards)
+
+    def add(self, cards: list[CardRecord]):
+        self.cards.extend(cards)
+
+    def to_columns(self) -> CardColumns:
+        return CardColumns.from_cards(self.cards)
+
+    @property
+    def num_of_pages(self) -> int:
+        return max((card.page for card in self.cards), default=0)
+
+    def rated(self) -> list[CardRecord]:
+        return [card for card in self.cards if card.rating >= 0]
+
+    def priced(self) -> list[CardRecord]:
+        return [card for card in self.cards if card.price != float("inf")]
+
+    def top_rated(self, k: int = 1) -> list[CardRecord]:
+        """
+        Finds the k highest rated cards.
+
+        Args:
+            k (int, optional): The number of cards to return. Defaults to 1.
+
+        Returns:
+            list[CardRecord]: The cards, from the highest rated down.
+        """
+
+        return top_k(self.cards, k, rating_score)
+
+    def top_reviewed(self, k: int = 1, min_reviews: int = MIN_REVIEWS) -> list[CardRecord]:
+        """
+        Finds the k highest rated cards among the ones with enough reviews.
+
+        Args:
+            k (int, optional): The number of cards to return. Defaults to 1.
+            min_reviews (int, optional): The number of reviews a card needs. Defaults to MIN_REVIEWS.
+
+        Returns:
+            list[CardRecord]: The cards, from the highest rated down.
+        """
+
+        return top_k(self.cards, k, reviewed_rating_score(min_reviews))
+
+    def cheapest(self, k: int = 1) -> list[CardRecord]:
+        """
+        Finds the k cheapest cards.
+
+        Args:
+            k (int, optional): The number of cards to return. Defaults to 1.
+
+        Returns:
+            list[CardRecord]: The cards, from the cheapest up.
+        """
+
+        return top_k(self.cards, k, price_score)
+
+    def best_value(self, k: int = 1) -> list[CardRecord]:
+        """
+        Finds the k cards with the best rating per price.
+
+        Args:
+            k (int, optional): The number of cards to return. Defaults to 1.
+
+        Returns:
+            list[CardRecord]: The cards, from the best value down.
+        """
+
+        return top_k(self.cards, k, value_score)
+
+    def rank(self, k: int = 5, min_reviews: int = MIN_REVIEWS) -> dict[str, list[CardRecord]]:
+        """
+        Builds all the shortlists of the cards at once (see Ranker).
+
+        Args:
+            k (int, optional): The number of cards in every shortlist. Defaults to 5.
+            min_reviews (int, optional): The number of reviews a card needs to be in the
+                                         "reviewed_rating" shortlist. Defaults to MIN_REVIEWS.
+
+        Returns:
+            dict[str, list[CardRecord]]: The cards of every ranking, from the best down.
+        """
+
+        ranker = Ranker(k, min_reviews)
+        ranker.add(self.cards)
+
+        return ranker.results()
+
+    def highest_rated(self) -> CardRecord | None:
+        best = self.top_rated(1)
+        return best[0] if best else None
+
+    def lowest_priced(self) -> CardRecord | None:
+        best = self.cheapest(1)
+        return best[0] if best else None
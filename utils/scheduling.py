@@ -0,0 +1,102 @@
+from itertools import cycle
+import pytest
+
+try:
+    from xdist.scheduler import LoadScheduling
+except ImportError:  # pytest-xdist is optional
+    LoadScheduling = None
+
+# Where the durations of the last runs are kept in the pytest cache
+DURATIONS_CACHE_KEY = "airbnb-testing/durations"
+
+
+def sort_longest_first(items: list, durations: dict[str, float]):
+    """
+    Sorts test items in place, the ones that took the longest in earlier runs first.
+
+    Items that never ran before are considered the longest, since nothing is known about them.
+    Items with the same duration keep their order.
+
+    Args:
+        items (list): The test items.
+        durations (dict[str, float]): The last duration of every test, in seconds, by node id.
+    """
+
+    unknown_duration = float("inf")
+    items.sort(key=lambda item: -durations.get(item.nodeid, unknown_duration))
+
+
+class DurationRecorder:
+    """
+    Records how long every test takes (setup, call and teardown) in the pytest cache, for the next runs.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.durations: dict[str, float] = {}
+
+    def pytest_runtest_logreport(self, report):
+        if report.when == "setup":
+            self.durations[report.nodeid] = 0.0
+
+        self.durations[report.nodeid] = self.durations.get(report.nodeid, 0.0) + report.duration
+
+    def pytest_sessionfinish(self, session):
+        if not self.durations or getattr(self.config, "cache", None) is None:
+            return
+
+        previous_durations = self.config.cache.get(DURATIONS_CACHE_KEY, {})
+        self.config.cache.set(DURATIONS_CACHE_KEY, {**previous_durations, **self.durations})
+
+
+if LoadScheduling is not None:
+
+    class LongestFirstScheduling(LoadScheduling):
+        """
+        Load scheduling that sends a test to a worker only when it is about to need one,
+        so the tests (sorted longest first by every worker) go to whichever worker frees up first.
+
+        Workers always hold two tests, the one they run and the next one, since a worker
+        needs to know its next test before running the current one.
+        """
+
+        def __init__(self, config, log=None):
+            super().__init__(config, log)
+            self.maxschedchunk = 1
+
+        def schedule(self):
+            assert self.collection_is_completed
+
+            if self.collection is not None:
+                for node in self.nodes:
+                    self.check_schedule(node)
+                return
+
+            if not self._check_nodes_have_same_collection():
+                self.log("**Different tests collected, aborting run**")
+                return
+
+            self.collection = next(iter(self.node2collection.values()))
+            self.pending[:] = range(len(self.collection))
+
+            # Deal the tests one by one, so the longest ones go to different workers
+            nodes = cycle(self.nodes)
+
+            for _ in range(min(len(self.pending), 2 * len(self.nodes))):
+                self._send_tests(next(nodes), 1)
+
+            if not self.pending:
+                for node in self.nodes:
+                    node.shutdown()
+
+
+class LongestFirstPlugin:
+    """
+    Makes pytest-xdist's load distribution (-n N, the default --dist) schedule the longest tests first.
+    """
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_xdist_make_scheduler(self, config, log):
+        if config.getvalue("dist") == "load":
+            return LongestFirstScheduling(config, log)
+        return None
@@ -0,0 +1,60 @@
+from dataclasses import dataclass, replace
+from datetime import datetime
+from urllib.parse import quote, urlencode, urljoin
+
+# How a search is made: by loading its results URL, or by filling the search form of the home page
+SEARCH_MODES = ("url", "ui")
+
+
+@dataclass(frozen=True)
+class SearchQuery:
+    """
+    The parameters of a search. It is hashable, so it identifies the results of the search.
+
+    Attributes:
+        location (str): Where to search.
+        check_in_date (datetime): The check-in date.
+        check_out_date (datetime): The check-out date.
+        num_of_adults (int): The number of adult guests.
+        num_of_children (int): The number of child guests.
+    """
+
+    location: str
+    check_in_date: datetime
+    check_out_date: datetime
+    num_of_adults: int = 0
+    num_of_children: int = 0
+
+    def with_dates(self, check_in_date: datetime, check_out_date: datetime) -> "SearchQuery":
+        return replace(self, check_in_date=check_in_date, check_out_date=check_out_date)
+
+    def with_guests(self, num_of_adults: int, num_of_children: int = 0) -> "SearchQuery":
+        return replace(self, num_of_adults=num_of_adults, num_of_children=num_of_children)
+
+    @property
+    def num_of_guests(self) -> int:
+        return self.num_of_adults + self.num_of_children
+
+    def params(self) -> dict:
+        return {
+            "query": self.location,
+            "checkin": self.check_in_date.strftime("%Y-%m-%d"),
+            "checkout": self.check_out_date.strftime("%Y-%m-%d"),
+            "adults": self.num_of_adults,
+            "children": self.num_of_children,
+        }
+
+    def url(self, base_url: str) -> str:
+        """
+        Builds the URL of the first results page of the search.
+
+        Args:
+            base_url (str): The URL of the site.
+
+        Returns:
+            str: For example "https://www.airbnb.com/s/Tel-Aviv/homes?query=Tel+Aviv&checkin=2025-05-01&...".
+        """
+
+        path = f"s/{quote(self.location.replace(' ', '-'))}/homes"
+
+        return f"{urljoin(base_url, path)}?{urlencode(self.params())}"
@@ -0,0 +1,123 @@
+from dataclasses import dataclass
+import logging
+from typing import Iterable
+from utils.listing_store import ListingStore
+from utils.records import CardRecord
+from utils.results_scan import ResultsScan
+from utils.search_query import SearchQuery
+
+
+@dataclass
+class CachedSearch:
+    """
+    A search made by a test.
+
+    Attributes:
+        results_url (str): The URL of the first results page.
+        results_scan (ResultsScan | None): The scan of the results, if one was made.
+        scan_id (int | None): The id of the scan in the listing store, if it was recorded.
+    """
+
+    results_url: str
+    results_scan: ResultsScan | None = None
+    scan_id: int | None = None
+
+
+class SearchSession:
+    """
+    The searches made on a site by the tests of a module in one browser, so every distinct search
+    is made once and the next tests land directly on its results.
+
+    With a listing store, the scans are incremental and recorded in the store,
+    with the booking snapshots of the listings read by refresh_details.
+    """
+
+    def __init__(self, base_url: str, mode: str = "url", store: ListingStore | None = None):
+        self.base_url = base_url
+        self.mode = mode
+        self.store = store
+        self.searches: dict[SearchQuery, CachedSearch] = {}
+
+    def search(self, page, query: SearchQuery, mode: str | None = None):
+        """
+        Gets to the results of a search.
+
+        The first time, the search is made in the given mode, or else the mode of the session (see HomePage.search).
+        Afterwards, the page goes straight to the results URL recorded then.
+
+        Args:
+            page (Page): The (new) page of the test.
+            query (SearchQuery): The parameters of the search.
+            mode (str | None, optional): "url" or "ui", for the tests that must search one way. Defaults to the mode of the session.
+
+        Returns:
+            SearchResultsPage: The first results page.
+        """
+
+        # Imported here since the page objects import the utils
+        from pages.home_page import HomePage
+        from pages.search_results import SearchResultsPage
+
+        cached_search = self.searches.get(query)
+
+        if cached_search is not None:
+            logging.info(f"Reusing the results of an earlier search: {cached_search.results_url}")
+            page.goto(cached_search.results_url)
+
+            return SearchResultsPage(page)
+
+        HomePage(page, self.base_url).search(query, mode or self.mode)
+
+        search_results_page = SearchResultsPage(page)
+        search_results_page.wait_for_cards()
+
+        self.searches[query] = CachedSearch(page.url)
+
+        return search_results_page
+
+    def scan(self, search_results_page, query: SearchQuery) -> ResultsScan:
+        """
+        Scans the results of a search, unless an earlier test already did.
+
+        Args:
+            search_results_page (SearchResultsPage): The results page returned by search().
+            query (SearchQuery): The parameters of the search.
+
+        Returns:
+            ResultsScan: The cards of all the pages.
+        """
+
+        cached_search = self.searches[query]
+
+        if cached_search.results_scan is None and self.store is None:
+            cached_search.results_scan = search_results_page.scan()
+        elif cached_search.results_scan is None:
+            cached_search.scan_id = self.store.start_scan(query)
+            cached_search.results_scan = search_results_page.scan_incremental(
+                self.store, query, cached_search.scan_id
+            )
+
+        return cached_search.results_scan
+
+    def refresh_details(self, search_results_page, query: SearchQuery, cards: Iterable[CardRecord]) -> int:
+        """
+        Records the booking snapshots of the details pages of some cards of a scanned search in the
+        listing store, reading only the listings that are new or changed (see SearchResultsPage.refresh_details).
+
+        Without a listing store, nothing is read.
+
+        Args:
+            search_results_page (SearchResultsPage): The results page returned by search().
+            query (SearchQuery): The parameters of the search.
+            cards (Iterable[CardRecord]): The cards, for example the top rated ones of the scan.
+
+        Returns:
+            int: The number of snapshots recorded.
+        """
+
+        cached_search = self.searches[query]
+
+        if self.store is None or cached_search.scan_id is None:
+            return 0
+
+        return search_results_page.refresh_details(self.store, query, cached_search.scan_id, cards)
@@ -0,0 +1,574 @@
+import base64
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import random
+import threading
+import time
+from urllib.parse import parse_qs, quote, unquote, urlencode, urlparse
+from utils.util import format_date_to_airbnb
+
+
+@dataclass
+class StandInConfig:
+    """
+    The configuration of the stand-in server.
+
+    Attributes:
+        num_of_pages (int): The number of search results pages.
+        cards_per_page (int): The number of cards in every results page (the last one may have less).
+        num_of_listings (int | None): The total number of listings, num_of_pages * cards_per_page if None.
+        delay (float): Seconds to wait before answering every request.
+        translation_popup (bool): Whether the details page shows the translation popup.
+        popup_delay (float): Seconds until the translation popup shows up.
+        total_delay (float): Seconds until the details page shows its total price.
+        reservation_layout (str): "summary" for the "Trip details" layout, "left" for the
+                                  "Dates"/"Guests" sections layout.
+        phone_layout (str): "continue" to ask for the phone number after clicking "Continue",
+                            "inline" to show the phone number input right away.
+        new_listing_ratio (float): The part of the listings that have no rating yet.
+        calendar_start (date): The first month in the home page calendar.
+        calendar_months (int): The number of months in the home page calendar.
+        seed (int): The seed of the generated listings.
+    """
+
+    num_of_pages: int = 15
+    cards_per_page: int = 18
+    num_of_listings: int | None = None
+    delay: float = 0
+    translation_popup: bool = False
+    popup_delay: float = 0
+    total_delay: float = 0
+    reservation_layout: str = "summary"
+    phone_layout: str = "continue"
+    new_listing_ratio: float = 0.1
+    calendar_start: date = field(default_factory=lambda: date(date.today().year - 1, 1, 1))
+    calendar_months: int = 36
+    seed: int = 0
+
+    @property
+    def total_listings(self) -> int:
+        if self.num_of_listings is not None:
+            return self.num_of_listings
+        return self.num_of_pages * self.cards_per_page
+
+    @property
+    def total_pages(self) -> int:
+        return max(1, -(-self.total_listings // self.cards_per_page))
+
+
+@dataclass
+class Listing:
+    id: int
+    title: str
+    rating: float | None
+    reviews: int
+    nightly_price: int
+
+
+FIRST_LISTING_ID = 1_000_000
+
+LISTING_KINDS = ("Apartment", "Condo", "Loft", "Guest suite", "Home")
+
+PAGE_STYLE = """
+body { font-family: sans-serif; margin: 0; }
+header, main, footer { padding: 16px; }
+.grid { display: grid; grid-template-columns: repeat(3, 1fr); gap: 16px; }
+.card { border: 1px solid #ddd; padding: 8px; }
+.sr-only { position: absolute; width: 1px; height: 1px; overflow: hidden; clip: rect(0 0 0 0); }
+.row { display: flex; justify-content: space-between; }
+.calendar { display: flex; flex-wrap: wrap; gap: 16px; }
+.dialog { position: fixed; top: 20%; left: 30%; background: white; border: 1px solid black; padding: 16px; }
+"""
+
+
+def listing_at(config: StandInConfig, position: int) -> Listing:
+    """
+    Generates the listing at a position in the search results (the same one for the same config).
+    """
+
+    rng = random.Random(f"{config.seed}:{position}")
+
+    if rng.random() < config.new_listing_ratio:
+        rating, reviews = None, 0
+    else:
+        rating = round(rng.choice([5.0, rng.uniform(3.8, 5.0)]), 2)
+        reviews = rng.randint(3, 1500)
+
+    return Listing(
+        id=FIRST_LISTING_ID + position,
+        title=f"{rng.choice(LISTING_KINDS)} #{position + 1}",
+        rating=rating,
+        reviews=reviews,
+        nightly_price=rng.randint(40, 900),
+    )
+
+
+def encode_cursor(page_number: int, cards_per_page: int) -> str:
+    offset = json.dumps({"section_offset": 0, "items_offset": (page_number - 1) * cards_per_page})
+    return base64.b64encode(offset.encode()).decode()
+
+
+def decode_cursor(cursor: str | None, cards_per_page: int) -> int:
+    if not cursor:
+        return 1
+    try:
+        offset = json.loads(base64.b64decode(cursor))["items_offset"]
+    except ValueError:
+        return 1
+    return offset // cards_per_page + 1
+
+
+def parse_iso_date(value: str | None) -> datetime | None:
+    try:
+        return datetime.strptime(value, "%Y-%m-%d") if value else None
+    except ValueError:
+        return None
+
+
+def format_dates_range(check_in: datetime, check_out: datetime) -> str:
+    """
+    Formats a dates range the way the site does, for example "May 1 – 5, 2025" or "May 30 – Jun 2, 2025".
+    """
+
+    end = f"{check_out.day}" if check_in.month == check_out.month else format_date_to_airbnb(check_out, False)
+    return f"{format_date_to_airbnb(check_in, False)} – {end}, {check_in.year}"
+
+
+def format_guests(adults: int, children: int) -> str:
+    if not children:
+        return f"{adults} guest{'s' if adults != 1 else ''}"
+    return f"{adults} adult{'s' if adults != 1 else ''}, {children} child{'ren' if children != 1 else ''}"
+
+
+def html_page(title: str, body: str) -> str:
+    return (
+        "<!DOCTYPE html><html lang='en'><head><meta charset='utf-8'>"
+        f"<title>{escape(title)}</title><style>{PAGE_STYLE}</style></head>"
+        f"<body>{body}</body></html>"
+    )
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """
+    Renders the parts of the site the page objects depend on.
+    """
+
+    config: StandInConfig
+
+    def log_message(self, format, *args):
+        pass
+
+    # Helpers
+
+    def send(self, content: str, content_type: str = "text/html; charset=utf-8", status: int = 200):
+        body = content.encode()
+
+        if self.config.delay:
+            time.sleep(self.config.delay)
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def search_params(self, query: dict) -> dict:
+        first = lambda name, default=None: query.get(name, [default])[0]
+
+        return {
+            "check_in": parse_iso_date(first("checkin") or first("check_in")),
+            "check_out": parse_iso_date(first("checkout") or first("check_out")),
+            "adults": int(first("adults", first("numberOfAdults", "0"))),
+            "children": int(first("children", first("numberOfChildren", "0"))),
+        }
+
+    def page_listings(self, page_number: int) -> list[Listing]:
+        first_position = (page_number - 1) * self.config.cards_per_page
+        last_position = min(first_position + self.config.cards_per_page, self.config.total_listings)
+
+        return [listing_at(self.config, position) for position in range(first_position, last_position)]
+
+    def listing_by_id(self, listing_id: int) -> Listing | None:
+        position = listing_id - FIRST_LISTING_ID
+
+        if 0 <= position < self.config.total_listings:
+            return listing_at(self.config, position)
+        return None
+
+    # Routing
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        parts = [unquote(part) for part in url.path.split("/") if part]
+
+        if not parts:
+            self.send(self.home_page())
+        elif parts[0] == "s" and len(parts) >= 2:
+            self.send(self.results_page(parts[1].replace("-", " "), query))
+        elif parts[0] == "rooms" and len(parts) == 2 and parts[1].isdigit():
+            listing = self.listing_by_id(int(parts[1]))
+            if listing is None:
+                self.send(html_page("Not found", "<h1>Not found</h1>"), status=404)
+            else:
+                self.send(self.details_page(listing, query))
+        elif parts[:2] == ["book", "stays"] and len(parts) == 3:
+            self.send(self.reservation_page(query))
+        else:
+            self.send(html_page("Not found", "<h1>Not found</h1>"), status=404)
+
+    def do_POST(self):
+        url = urlparse(self.path)
+
+        if not url.path.startswith("/api/v3/StaysSearch"):
+            self.send("{}", "application/json", status=404)
+            return
+
+        length = int(self.headers.get("Content-Length") or 0)
+        request_data = json.loads(self.rfile.read(length) or b"{}")
+        cursor = ((request_data.get("variables") or {}).get("staysSearchRequest") or {}).get("cursor")
+
+        self.send(json.dumps(self.search_data(decode_cursor(cursor, self.config.cards_per_page))), "application/json")
+
+    # Pages
+
+    def home_page(self) -> str:
+        months = []
+        month_start = self.config.calendar_start.replace(day=1)
+
+        for _ in range(self.config.calendar_months):
+            next_month = (month_start + timedelta(days=32)).replace(day=1)
+            day = month_start
+            buttons = []
+
+            while day < next_month:
+                label = format_date_to_airbnb(datetime(day.year, day.month, day.day))
+                buttons.append(
+                    f"<button type='button' aria-label='{escape(label)}' data-date='{day.isoformat()}'"
+                    f" onclick='pickDate(this.dataset.date)'>{day.day}</button>"
+                )
+                day += timedelta(days=1)
+
+            months.append(f"<section><h3>{month_start.strftime('%B %Y')}</h3>{''.join(buttons)}</section>")
+            month_start = next_month
+
+        script = """
+        const state = { checkin: null, checkout: null, adults: 0, children: 0 };
+        function pickDate(value) {
+            if (!state.checkin || state.checkout) { state.checkin = value; state.checkout = null; }
+            else { state.checkout = value; }
+        }
+        function step(kind) {
+            state[kind] += 1;
+            document.querySelector(`[data-testid="stepper-${kind}-value"]`).textContent = state[kind];
+        }
+        function search() {
+            const location = document.querySelector('[data-testid="structured-search-input-field-query"]').value;
+            const params = new URLSearchParams({ query: location, adults: state.adults, children: state.children });
+            if (state.checkin) params.set("checkin", state.checkin);
+            if (state.checkout) params.set("checkout", state.checkout);
+            window.location.href = `/s/${encodeURIComponent(location.replace(/ /g, "-"))}/homes?${params}`;
+        }
+        """
+
+        body = f"""
+        <header>
+            <input data-testid="structured-search-input-field-query" placeholder="Search destinations">
+            <button type="button" data-testid="structured-search-input-field-guests-button"
+                    onclick="document.getElementById('guests').hidden = false">Who</button>
+            <button type="button" data-testid="structured-search-input-search-button" onclick="search()">Search</button>
+            <div id="guests" hidden>
+                <div>Adults <span data-testid="stepper-adults-value">0</span>
+                    <button type="button" data-testid="stepper-adults-increase-button" aria-label="increase value"
+                            onclick="step('adults')">+</button></div>
+                <div>Children <span data-testid="stepper-children-value">0</span>
+                    <button type="button" data-testid="stepper-children-increase-button" aria-label="increase value"
+                            onclick="step('children')">+</button></div>
+            </div>
+        </header>
+        <main class="calendar">{''.join(months)}</main>
+        <script>{script}</script>
+        """
+
+        return html_page("Stand-in home", body)
+
+    def results_page(self, location: str, query: dict) -> str:
+        params = self.search_params(query)
+        page_number = min(decode_cursor(query.get("cursor", [None])[0], self.config.cards_per_page), self.config.total_pages)
+        listings = self.page_listings(page_number)
+
+        # The query of every link to a listing or to another results page
+        link_query = {name: values[0] for name, values in query.items() if name != "cursor"}
+        listing_query = {
+            "check_in": link_query.get("checkin", ""),
+            "check_out": link_query.get("checkout", ""),
+            "adults": params["adults"],
+            "children": params["children"],
+        }
+
+        def page_url(number: int) -> str:
+            return f"{urlparse(self.path).path}?{urlencode({**link_query, 'cursor': encode_cursor(number, self.config.cards_per_page)})}"
+
+        cards = []
+
+        for listing in listings:
+            if listing.rating is None:
+                rating = "<div>New</div>"
+            else:
+                rating = (
+                    f"<div><span aria-hidden='true'>{listing.rating} ({listing.reviews})</span>"
+                    f"<span class='sr-only'>{listing.rating} out of 5 average rating, {listing.reviews} reviews</span></div>"
+                )
+
+            cards.append(
+                f"""<div data-testid="card-container" class="card">
+                    <a href="/rooms/{listing.id}?{urlencode(listing_query)}" target="_blank">
+                        <div>{escape(listing.title)} in {escape(location)}</div>
+                    </a>
+                    {rating}
+                    <div>${listing.nightly_price:,} night</div>
+                    <button type="button">Show price breakdown</button>
+                </div>"""
+            )
+
+        # Like the site: first, last, and the pages around the current one
+        shown_pages = sorted(
+            {1, self.config.total_pages}
+            | set(range(max(1, page_number - 2), min(self.config.total_pages, page_number + 2) + 1))
+        )
+
+        def page_link(label: str, number: int, disabled: bool, current: bool = False) -> str:
+            attributes = " aria-disabled='true'" if disabled else ""
+            attributes += " aria-current='page'" if current else ""
+            return f"<a href='{escape(page_url(number))}'{attributes}>{label}</a>"
+
+        pagination = [page_link("Previous", max(1, page_number - 1), page_number == 1)]
+        pagination += [page_link(str(number), number, number == page_number, number == page_number) for number in shown_pages]
+        pagination += [page_link("Next", min(self.config.total_pages, page_number + 1), page_number == self.config.total_pages)]
+
+        if params["check_in"] and params["check_out"]:
+            dates_text = format_dates_range(params["check_in"], params["check_out"])
+        else:
+            dates_text = "Any week"
+
+        search_request = {
+            "operationName": "StaysSearch",
+            "variables": {"staysSearchRequest": {"cursor": query.get("cursor", [None])[0]}},
+        }
+
+        body = f"""
+        <header>
+            <button type="button" data-testid="little-search-location"><div>{escape(location)}</div></button>
+            <button type="button" data-testid="little-search-anytime"><div>Dates</div><div>{escape(dates_text)}</div></button>
+            <button type="button" data-testid="little-search-guests"><div>{params['adults'] + params['children']} guests</div></button>
+        </header>
+        <main>
+            <h1 data-testid="stays-page-heading">{self.config.total_listings:,} places in {escape(location)}</h1>
+            <div class="grid">{''.join(cards)}</div>
+            <nav aria-label="Search results pagination">{''.join(pagination)}</nav>
+        </main>
+        <script>
+            fetch("/api/v3/StaysSearch?operationName=StaysSearch", {{
+                method: "POST",
+                headers: {{ "Content-Type": "application/json" }},
+                body: JSON.stringify({json.dumps(search_request)}),
+            }});
+        </script>
+        """
+
+        return html_page(f"{location} - Stays", body)
+
+    def search_data(self, page_number: int) -> dict:
+        """
+        The search data response of a results page, in the layout of the site's StaysSearch responses.
+        """
+
+        search_results = []
+
+        for listing in self.page_listings(page_number):
+            listing_id = base64.b64encode(f"DemandStayListing:{listing.id}".encode()).decode()
+
+            if listing.rating is None:
+                rating_label, rating_localized = "New place to stay", "New"
+            else:
+                rating_label = f"{listing.rating} out of 5 average rating, {listing.reviews} reviews"
+                rating_localized = f"{listing.rating} ({listing.reviews})"
+
+            search_results.append(
+                {
+                    "__typename": "StaySearchResult",
+                    "demandStayListing": {"id": listing_id},
+                    "title": listing.title,
+                    "avgRatingA11yLabel": rating_label,
+                    "avgRatingLocalized": rating_localized,
+                    "structuredDisplayPrice": {
+                        "primaryLine": {"price": f"${listing.nightly_price:,}", "qualifier": "night"}
+                    },
+                }
+            )
+
+        page_cursors = [encode_cursor(number, self.config.cards_per_page) for number in range(1, self.config.total_pages + 1)]
+
+        return {
+            "data": {
+                "presentation": {
+                    "staysSearch": {
+                        "results": {
+                            "paginationInfo": {"pageCursors": page_cursors},
+                            "searchResults": search_results,
+                        }
+                    }
+                }
+            }
+        }
+
+    def details_page(self, listing: Listing, query: dict) -> str:
+        params = self.search_params(query)
+        check_in = params["check_in"] or datetime.combine(date.today() + timedelta(days=30), datetime.min.time())
+        check_out = params["check_out"] or check_in + timedelta(days=2)
+        guests = max(1, params["adults"] + params["children"])
+        nights = max(1, (check_out - check_in).days)
+        total = listing.nightly_price * nights + 25 * nights
+
+        reservation_query = urlencode(
+            {
+                "checkin": check_in.strftime("%Y-%m-%d"),
+                "checkout": check_out.strftime("%Y-%m-%d"),
+                "numberOfAdults": params["adults"] or guests,
+                "numberOfChildren": params["children"],
+            }
+        )
+
+        popup = ""
+
+        if self.config.translation_popup:
+            popup = f"""
+            <template id="popup">
+                <div class="dialog" role="dialog">
+                    <h2>Translation on</h2>
+                    <button type="button" onclick="this.closest('.dialog').remove()">Close</button>
+                </div>
+            </template>
+            <script>
+                setTimeout(() => document.body.append(document.getElementById("popup").content.cloneNode(true)),
+                           {int(self.config.popup_delay * 1000)});
+            </script>
+            """
+
+        total_row = f"<div class='row'><span>Total</span><span>${total:,}</span></div>"
+
+        if self.config.total_delay:
+            # Like the site, the price breakdown comes in after the rest of the booking panel
+            total_row = f"""
+            <template id="total">{total_row}</template>
+            <script>
+                setTimeout(() => document.querySelector('[data-section-id="BOOK_IT_SIDEBAR"]')
+                                         .append(document.getElementById("total").content.cloneNode(true)),
+                           {int(self.config.total_delay * 1000)});
+            </script>
+            """
+
+        body = f"""
+        <main>
+            <h1>{escape(listing.title)}</h1>
+            <div data-section-id="BOOK_IT_SIDEBAR">
+                <div>${listing.nightly_price:,} night</div>
+                <button type="button" aria-label="Change dates; Check-in: {check_in:%Y-%m-%d}; Checkout: {check_out:%Y-%m-%d}">
+                    <div>CHECK-IN</div><div>{check_in.month}/{check_in.day}/{check_in.year}</div>
+                    <div>CHECKOUT</div><div>{check_out.month}/{check_out.day}/{check_out.year}</div>
+                </button>
+                <button type="button"><div>GUESTS</div><div>{guests} guests</div></button>
+                <button type="button" onclick="window.location.href = '/book/stays/{listing.id}?{reservation_query}'">Reserve</button>
+                <div class="row"><span>${listing.nightly_price:,} x {nights} nights</span><span>${listing.nightly_price * nights:,}</span></div>
+                {total_row}
+            </div>
+        </main>
+        {popup}
+        """
+
+        return html_page(listing.title, body)
+
+    def reservation_page(self, query: dict) -> str:
+        params = self.search_params(query)
+        dates_text = format_dates_range(params["check_in"], params["check_out"])
+        guests_text = format_guests(params["adults"], params["children"])
+
+        if self.config.reservation_layout == "summary":
+            details = f"""
+            <section>
+                <h2>Trip details</h2>
+                <div>{escape(dates_text)}</div>
+                <div>{escape(guests_text)}</div>
+                <button type="button">Change</button>
+            </section>
+            """
+        else:
+            details = f"""
+            <section><div>Dates</div><div>{escape(dates_text)}</div><button type="button">Edit</button></section>
+            <section><div>Guests</div><div>{escape(guests_text)}</div><button type="button">Edit</button></section>
+            """
+
+        phone_input = "<input data-testid='login-signup-phonenumber' type='tel'>"
+
+        if self.config.phone_layout == "continue":
+            phone = f"""
+            <div id="phone" hidden>{phone_input}</div>
+            <button type="button" onclick="document.getElementById('phone').hidden = false">Continue</button>
+            """
+        else:
+            phone = f"{phone_input}<button type='button'>Continue</button>"
+
+        body = f"""
+        <main>
+            <h1>Request to book</h1>
+            {details}
+            {phone}
+        </main>
+        """
+
+        return html_page("Request to book", body)
+
+
+class StandInServer:
+    """
+    A local HTTP server that stands in for the site, rendering what the page objects depend on:
+    the search form, the results grid and its pagination, the details page and the reservation page.
+
+    Usage:
+        with StandInServer(StandInConfig(num_of_pages=3)) as server:
+            page.goto(server.url)
+    """
+
+    def __init__(self, config: StandInConfig | None = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or StandInConfig()
+
+        handler = type("ConfiguredStandInHandler", (StandInHandler,), {"config": self.config})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def search_url(self, location: str, **params) -> str:
+        return f"{self.url}s/{quote(location.replace(' ', '-'))}/homes?{urlencode(params)}"
+
+    def start(self) -> "StandInServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -1,6 +1,30 @@
 from datetime import datetime
 import re
 
+# The rating line of a search result card, for example "4.85 out of 5 average rating"
+CARD_RATING_REGEX = re.compile(r"(\d\.\d+) out of 5 average rating")
+
+# The number of reviews of a card, for example "4.85 out of 5 average rating, 123 reviews"
+CARD_REVIEWS_REGEX = re.compile(r"([\d,]+) reviews?\b")
+
+# The line in which the price is displayed (right above "Show price breakdown")
+CARD_PRICE_LINE_REGEX = re.compile(r"([^\n]+)\n(?=Show price breakdown)")
+
+# The price itself
+PRICE_REGEX = re.compile(r"[^\d]*(\d[\d,\.]*)")
+
+# The guests button of the details page, for example "GUESTS 2 guests"
+TRIP_GUESTS_REGEX = re.compile(r"GUESTS\s+(\d+)\s+guests")
+
+# The total price row of the details page, for example "Total before taxes $1,234"
+TOTAL_PRICE_REGEX = re.compile(r"Total[^\d]*([\d,]*)[^\d]*")
+
+# The nightly price in the booking panel of the details page, for example "$120 night"
+NIGHTLY_PRICE_REGEX = re.compile(r"(\d[\d,\.]*)\s*night\b")
+
+# The listing id in a listing link, for example "/rooms/12345?check_in=..."
+LISTING_ID_REGEX = re.compile(r"/rooms/(?:plus/)?(\d+)")
+
 
 def format_date_to_airbnb(date: datetime, verbose: bool = True):
     """
@@ -108,3 +132,165 @@ def parse_guests(guests_str: str):
     total = adults + children
 
     return total, adults, children
+
+
+def parse_card_rating(card_text: str) -> float | int:
+    """
+    Extracts the rating from the text of a search result card.
+
+    Args:
+        card_text (str): The inner text of the card.
+
+    Returns:
+        float: The extracted rating as a float if found, otherwise -1.
+    """
+
+    match_rating = CARD_RATING_REGEX.search(card_text)
+
+    if match_rating:
+        return float(match_rating.group(1))
+
+    return -1
+
+
+def parse_card_reviews(card_text: str) -> int:
+    """
+    Extracts the number of reviews from the text of a search result card.
+
+    Args:
+        card_text (str): The inner text of the card.
+
+    Returns:
+        int: The number of reviews, 0 if not found.
+    """
+
+    match_reviews = CARD_REVIEWS_REGEX.search(card_text)
+
+    if match_reviews:
+        return int(match_reviews.group(1).replace(",", ""))
+
+    return 0
+
+
+def parse_card_price(card_text: str) -> float:
+    """
+    Extracts the price from the text of a search result card.
+
+    Args:
+        card_text (str): The inner text of the card.
+
+    Returns:
+        float: The extracted price as a float if found, otherwise infinity.
+    """
+
+    # Get the price line
+    match_price_line = CARD_PRICE_LINE_REGEX.search(card_text)
+
+    if match_price_line:
+        # Extract the price from the line
+        match_price = PRICE_REGEX.search(match_price_line.group(1))
+
+        if match_price:
+            # Convert the price to a float
+            return float(match_price.group(1).replace(",", ""))
+
+    return float("inf")
+
+
+def parse_listing_id(url: str | None) -> str | None:
+    """
+    Extracts the listing id from a listing link.
+
+    Args:
+        url (str | None): The link to the listing's details page.
+
+    Returns:
+        str | None: The listing id if found, otherwise None.
+    """
+
+    if not url:
+        return None
+
+    match_id = LISTING_ID_REGEX.search(url)
+
+    return match_id.group(1) if match_id else None
+
+
+def parse_trip_dates(dates_text: str) -> tuple[datetime, datetime]:
+    """
+    Parses the text of the dates button of the apartment details page.
+
+    Args:
+        dates_text (str): The text of the button, for example "CHECK-IN\n5/1/2025\nCHECKOUT\n5/5/2025".
+
+    Returns:
+        tuple[datetime, datetime]: The check-in and check-out dates.
+    """
+
+    lines = dates_text.split("\n")
+
+    # The dates are in the format "month/day/year"
+    check_in_date = datetime.strptime(lines[1], "%m/%d/%Y")
+    check_out_date = datetime.strptime(lines[3], "%m/%d/%Y")
+
+    return check_in_date, check_out_date
+
+
+def parse_trip_guests(guests_text: str) -> int:
+    """
+    Parses the text of the guests button of the apartment details page.
+
+    Args:
+        guests_text (str): The text of the button, for example "GUESTS\n2 guests".
+
+    Returns:
+        int: The number of guests.
+
+    Raises:
+        ValueError: If the number of guests could not be found in the text.
+    """
+
+    match = TRIP_GUESTS_REGEX.search(guests_text)
+
+    if not match:
+        raise ValueError("Could not find the number of guests in the text.")
+
+    return int(match.group(1))
+
+
+def parse_total_price(total_text: str) -> int:
+    """
+    Parses the total price row of the apartment details page.
+
+    Args:
+        total_text (str): The text of the row, for example "Total\n$1,234".
+
+    Returns:
+        int: The total price.
+
+    Raises:
+        ValueError: If the total price could not be found in the text.
+    """
+
+    match = TOTAL_PRICE_REGEX.search(total_text)
+
+    if not match or not match.group(1).replace(",", ""):
+        raise ValueError("Could not find the total price in the text.")
+
+    return int(match.group(1).replace(",", ""))
+
+
+def parse_nightly_price(booking_text: str) -> float | None:
+    """
+    Extracts the nightly price from the text of the booking panel of the apartment details page.
+
+    Args:
+        booking_text (str): The inner text of the panel, for example "$120 night\nCHECK-IN...".
+
+    Returns:
+        float | None: The nightly price if found, otherwise None.
+    """
+
+    match = NIGHTLY_PRICE_REGEX.search(booking_text)
+
+    return float(match.group(1).replace(",", "")) if match else None